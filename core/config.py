@@ -13,9 +13,100 @@ FRAME_DIR = "frame"
 SUBTITLE_DIR = "subtitle"
 SHORT_DIR = "short"
 FINAL_DIR = "final"
+INFO_DIR = "info"
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "GEMINI_3_FLASH")
 HF_TOKEN = os.getenv("HF_TOKEN")
 
 ENGAGEMENT_THRESHOLD = float(os.getenv("ENGAGEMENT_THRESHOLD", "0.65"))
+
+# Transcripts longer than CHAPTER_WINDOW_SECONDS are chapterized in overlapping
+# windows with up to CHAPTER_CONCURRENCY parallel requests (0 = always one request)
+CHAPTER_WINDOW_SECONDS = float(os.getenv("CHAPTER_WINDOW_SECONDS", "1800"))
+CHAPTER_WINDOW_OVERLAP_SECONDS = float(os.getenv("CHAPTER_WINDOW_OVERLAP_SECONDS", "120"))
+CHAPTER_CONCURRENCY = int(os.getenv("CHAPTER_CONCURRENCY", "4"))
+
+# Render mode: "fused" (one ffmpeg job per short), "batch" (one ffmpeg job for
+# all shorts, decoding the source once) or "legacy" (multi-step)
+RENDER_MODE = os.getenv("RENDER_MODE", "fused")
+
+# Concurrent short renders (1 = sequential, 0 = derive from the core budget)
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "1"))
+# Cores shared by concurrent renders (0 = all cores)
+RENDER_CPU_BUDGET = int(os.getenv("RENDER_CPU_BUDGET", "0"))
+
+# Persistent artifact cache (downloads, transcripts, chapters, detections)
+ARTIFACT_CACHE_DIR = Path(os.getenv("ARTIFACT_CACHE_DIR", "cache"))
+# Disk budget in GB, LRU-evicted (0 disables the cache)
+ARTIFACT_CACHE_MAX_GB = float(os.getenv("ARTIFACT_CACHE_MAX_GB", "20"))
+
+# Gemini response cache: entries expire after LLM_CACHE_TTL_HOURS (0 = never),
+# LRU-evicted above LLM_CACHE_MAX_MB (0 disables it); BYPASS skips lookups
+LLM_CACHE_DIR = Path(os.getenv("LLM_CACHE_DIR", str(ARTIFACT_CACHE_DIR / "llm")))
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "200"))
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "168"))
+LLM_CACHE_BYPASS = os.getenv("LLM_CACHE_BYPASS", "false").lower() in ("1", "true", "yes")
+
+# Gemini gateway: per-request timeout and retries with exponential backoff
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "120"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_BACKOFF_SECONDS = float(os.getenv("LLM_BACKOFF_SECONDS", "2"))
+
+# Evict the resident diarization pipeline above this process memory in MB
+# (VRAM on cuda, RSS on cpu; 0 = never evict)
+DIARIZATION_MEMORY_CEILING_MB = float(os.getenv("DIARIZATION_MEMORY_CEILING_MB", "0"))
+
+# Local facecam detector runs before Gemini; Gemini is only asked below this confidence
+STREAMER_LOCAL_DETECTION = os.getenv("STREAMER_LOCAL_DETECTION", "true").lower() in ("1", "true", "yes")
+STREAMER_LOCAL_MIN_CONFIDENCE = float(os.getenv("STREAMER_LOCAL_MIN_CONFIDENCE", "0.8"))
+STREAMER_LOCAL_FRAMES = int(os.getenv("STREAMER_LOCAL_FRAMES", "12"))
+FRAME_SAMPLE_WIDTH = int(os.getenv("FRAME_SAMPLE_WIDTH", "640"))
+FRAME_JPEG_QUALITY = int(os.getenv("FRAME_JPEG_QUALITY", "85"))
+
+# Per-channel facecam layouts, reused for new videos after a cheap check on a few frames
+CHANNEL_LAYOUT_CACHE = os.getenv("CHANNEL_LAYOUT_CACHE", "true").lower() in ("1", "true", "yes")
+CHANNEL_LAYOUT_PATH = Path(
+    os.getenv("CHANNEL_LAYOUT_PATH", str(ARTIFACT_CACHE_DIR / "channel_layouts.json"))
+)
+CHANNEL_LAYOUT_VERIFY_FRAMES = int(os.getenv("CHANNEL_LAYOUT_VERIFY_FRAMES", "2"))
+CHANNEL_LAYOUT_MIN_COVERAGE = float(os.getenv("CHANNEL_LAYOUT_MIN_COVERAGE", "0.6"))
+
+# faster-whisper engine defaults (overridable per job via ASRConfig)
+ASR_MODEL = os.getenv("ASR_MODEL", "medium")
+ASR_COMPUTE_TYPE = os.getenv("ASR_COMPUTE_TYPE", "int8")
+ASR_CPU_THREADS = int(os.getenv("ASR_CPU_THREADS", "0"))
+ASR_NUM_WORKERS = int(os.getenv("ASR_NUM_WORKERS", "1"))
+ASR_BEAM_SIZE = int(os.getenv("ASR_BEAM_SIZE", "5"))
+ASR_BATCHED = os.getenv("ASR_BATCHED", "false").lower() in ("1", "true", "yes")
+ASR_BATCH_SIZE = int(os.getenv("ASR_BATCH_SIZE", "16"))
+# Streaming transcription: fixed windows with overlap, written as JSONL
+ASR_STREAMING = os.getenv("ASR_STREAMING", "false").lower() in ("1", "true", "yes")
+ASR_WINDOW_SECONDS = float(os.getenv("ASR_WINDOW_SECONDS", "600"))
+ASR_WINDOW_OVERLAP_SECONDS = float(os.getenv("ASR_WINDOW_OVERLAP_SECONDS", "10"))
+
+# Transcript files: "json" or "columnar" (memory-mappable .tcol, much smaller
+# and faster to load on long videos)
+TRANSCRIPT_FORMAT = os.getenv("TRANSCRIPT_FORMAT", "json")
+
+# Audio acquisition: "native" (no transcode), "pcm" (16 kHz mono WAV) or "mp3"
+AUDIO_FORMAT = os.getenv("AUDIO_FORMAT", "native")
+
+# Download only the selected chapter ranges (+ padding) instead of the full video.
+# Off by default: the range download has to wait for chapterization, while the
+# full video downloads in parallel with ASR
+VIDEO_RANGE_DOWNLOAD = os.getenv("VIDEO_RANGE_DOWNLOAD", "false").lower() in ("1", "true", "yes")
+VIDEO_RANGE_PADDING_SECONDS = float(os.getenv("VIDEO_RANGE_PADDING_SECONDS", "2"))
+
+# Source resolution is picked from the planned crop: the lowest quality that
+# gives VIDEO_PIXEL_DENSITY source pixels per output pixel (1.0 = no upscaling),
+# never above VIDEO_MAX_HEIGHT. Disabled, 1080p is always used.
+VIDEO_AUTO_QUALITY = os.getenv("VIDEO_AUTO_QUALITY", "true").lower() in ("1", "true", "yes")
+VIDEO_PIXEL_DENSITY = float(os.getenv("VIDEO_PIXEL_DENSITY", "0.5"))
+VIDEO_MAX_HEIGHT = int(os.getenv("VIDEO_MAX_HEIGHT", "2160"))
+
+# yt-dlp: parallel DASH/HLS fragment fetching and optional rate limits
+# (e.g. "10M" = 10 MiB/s; empty = unlimited)
+DOWNLOAD_CONCURRENT_FRAGMENTS = int(os.getenv("DOWNLOAD_CONCURRENT_FRAGMENTS", "4"))
+DOWNLOAD_RATE_LIMIT = os.getenv("DOWNLOAD_RATE_LIMIT", "")
+DOWNLOAD_THROTTLED_RATE = os.getenv("DOWNLOAD_THROTTLED_RATE", "")
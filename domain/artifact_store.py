@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import List, Optional, Union
+
+from core.config import ARTIFACT_CACHE_DIR, ARTIFACT_CACHE_MAX_GB
+
+META_FILE = "meta.json"
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Streams a file through sha256 without loading it into memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """Hard-links when possible (same filesystem), otherwise copies."""
+    if dst.exists():
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+class ArtifactStore:
+    """
+    Persistent content-addressed store for pipeline stage outputs.
+
+    Entries are keyed by stage + video id + stage parameters and laid out as:
+        <root>/<stage>/<key>/<files...>
+        <root>/<stage>/<key>/meta.json   (mtime = last access, used for LRU)
+
+    The store lives outside the per-run data directory, so it survives the
+    data cleanup and is bounded by max_bytes with LRU eviction instead.
+    """
+
+    def __init__(self, root: Union[str, Path], max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def make_key(stage: str, video_id: str, params: dict) -> str:
+        payload = json.dumps(
+            {"stage": stage, "video_id": video_id, "params": params},
+            sort_keys=True,
+            default=str,
+        )
+        return hash_bytes(payload.encode("utf-8"))[:32]
+
+    def _entry_dir(self, stage: str, video_id: str, params: dict) -> Path:
+        return self.root / stage / self.make_key(stage, video_id, params)
+
+    def fetch(
+        self, stage: str, video_id: str, params: dict, dest_dir: Path
+    ) -> Optional[List[Path]]:
+        """
+        Restores a cached entry into dest_dir.
+
+        Returns:
+            List of restored paths, or None on a cache miss.
+        """
+        if not self.enabled:
+            return None
+
+        entry = self._entry_dir(stage, video_id, params)
+        meta_path = entry / META_FILE
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            restored = []
+            for name in meta["files"]:
+                dst = dest_dir / name
+                _link_or_copy(entry / name, dst)
+                restored.append(dst)
+            # Touch for LRU bookkeeping
+            os.utime(meta_path)
+        except (FileNotFoundError, KeyError, json.JSONDecodeError):
+            return None
+
+        print(f"-> Cache hit: {stage} ({video_id})")
+        return restored
+
+    def store(
+        self, stage: str, video_id: str, params: dict, files: List[Path]
+    ) -> None:
+        """
+        Saves stage outputs, then enforces the disk budget.
+
+        Best-effort: a failed cache write is logged and never fails the
+        pipeline stage that produced the files.
+        """
+        if not self.enabled:
+            return
+
+        try:
+            self._publish(stage, video_id, params, files)
+            self.evict()
+        except OSError as e:
+            print(f"Warning: Could not cache {stage} ({video_id}): {e}")
+
+    def _publish(
+        self, stage: str, video_id: str, params: dict, files: List[Path]
+    ) -> None:
+        entry = self._entry_dir(stage, video_id, params)
+        tmp = self.root / ".tmp" / uuid.uuid4().hex
+        tmp.mkdir(parents=True, exist_ok=True)
+        try:
+            for f in files:
+                _link_or_copy(f, tmp / f.name)
+            meta = {
+                "stage": stage,
+                "video_id": video_id,
+                "params": params,
+                "files": [f.name for f in files],
+                "created_at": time.time(),
+            }
+            (tmp / META_FILE).write_text(
+                json.dumps(meta, ensure_ascii=False, indent=2, default=str),
+                encoding="utf-8",
+            )
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            if entry.exists():
+                shutil.rmtree(entry, ignore_errors=True)
+            try:
+                # Atomic publish so concurrent jobs never see half-written entries
+                os.replace(tmp, entry)
+            except OSError:
+                # Another job published the same key first (non-empty target)
+                if not (entry / META_FILE).exists():
+                    raise
+        finally:
+            if tmp.exists():
+                shutil.rmtree(tmp, ignore_errors=True)
+
+    def evict(self) -> None:
+        """Deletes least recently used entries until the store fits max_bytes."""
+        if not self.enabled or not self.root.exists():
+            return
+
+        entries = []
+        total = 0
+        for meta_path in self.root.glob(f"*/*/{META_FILE}"):
+            entry = meta_path.parent
+            try:
+                size = sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+                last_access = meta_path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            entries.append((last_access, size, entry))
+            total += size
+
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            print(f"-> Cache evict: {entry.parent.name}/{entry.name}")
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+
+# Global store instance (Singleton pattern)
+_ARTIFACT_STORE: Optional[ArtifactStore] = None
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Returns the process-wide artifact store."""
+    global _ARTIFACT_STORE
+    if _ARTIFACT_STORE is None:
+        _ARTIFACT_STORE = ArtifactStore(
+            root=ARTIFACT_CACHE_DIR,
+            max_bytes=int(ARTIFACT_CACHE_MAX_GB * 1024**3),
+        )
+    return _ARTIFACT_STORE
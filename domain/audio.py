@@ -1,18 +1,22 @@
 from pathlib import Path
 from typing import Optional, Union, List
+from model.asr_config import ASRConfig
 from model.short import Short
 from model.transcript import TranscriptionMode
 from model.chapter import Chapter
-from service.transcribe_audio import transcribe_audio
+from service.transcribe_audio import transcribe_audio, DEFAULT_ASR_CONFIG
 from service.chapterize_transcript import chapterize_transcript
 from service.generate_subtitle import generate_subtitle
+from domain.job import JobContext
 from domain.paths import Paths
+from domain.word_index import WordIndex
 from utils.load_chapters import load_chapters
 
 
 class Audio:
-    def __init__(self, path: Union[str, Path]):
+    def __init__(self, path: Union[str, Path], job: Optional[JobContext] = None):
         self.path = Path(path)
+        self.job = job
         self.chapters: Optional[List[Chapter]] = None
         self.shorts: List[Short] = []
 
@@ -25,12 +29,16 @@ class Audio:
         mode: TranscriptionMode = TranscriptionMode.BOTH,
         min_speakers: Optional[int] = None,
         max_speakers: Optional[int] = None,
+        keep_models: bool = False,
+        asr_config: ASRConfig = DEFAULT_ASR_CONFIG,
     ):
         """
         Calls the transcription service.
 
         Args:
             mode: Transcription granularity.
+            keep_models: Keep the diarization model resident for later jobs.
+            asr_config: faster-whisper engine settings.
 
         Returns:
             None
@@ -42,6 +50,9 @@ class Audio:
             mode=mode,
             min_speakers=min_speakers,
             max_speakers=max_speakers,
+            job=self.job,
+            keep_diarization_model=keep_models,
+            asr_config=asr_config,
         )
         for transcript_path in transcripts:
             if ".sentence." in transcript_path.name:
@@ -63,7 +74,8 @@ class Audio:
 
         # Call external service
         self._chapters_json_path = chapterize_transcript(
-            transcript_path=self._sentence_json_path
+            transcript_path=self._sentence_json_path,
+            job=self.job,
         )
 
         if not self._chapters_json_path or not self._chapters_json_path.exists():
@@ -84,10 +96,14 @@ class Audio:
         if not self.chapters:
             raise RuntimeError("Chapters not found. Call chapterize() first.")
 
+        paths = self.job or Paths
+        # One load + index for all chapters instead of a parse per chapter
+        word_index = WordIndex.load(self._word_json_path)
+
         shorts = []
         for i, ch in enumerate(self.chapters, start=1):
-            subtitle_path = Paths.get_subtitle_dir() / f"{self.path.stem}_{i}.ass"
-            title_path = Paths.get_short_output_dir() / f"{self.path.stem}_{i}.txt"
+            subtitle_path = paths.get_subtitle_dir() / f"{self.path.stem}_{i}.ass"
+            title_path = paths.get_short_output_dir() / f"{self.path.stem}_{i}.txt"
             if write_titles:
                 title_path.write_text(ch.title.strip(), encoding="utf-8")
             generate_subtitle(
@@ -95,6 +111,7 @@ class Audio:
                 output_path=subtitle_path,
                 start=float(ch.start),
                 end=float(ch.end),
+                word_index=word_index,
             )
             short = Short(
                 chapter=ch,
@@ -113,6 +130,8 @@ class Audio:
         write_titles: bool = True,
         min_speakers: Optional[int] = None,
         max_speakers: Optional[int] = None,
+        keep_models: bool = False,
+        asr_config: ASRConfig = DEFAULT_ASR_CONFIG,
     ) -> List[Short]:
         """
         Runs the full pipeline: transcribe, chapterize, and generate subtitles.
@@ -121,6 +140,8 @@ class Audio:
             mode=transcription_mode,
             min_speakers=min_speakers,
             max_speakers=max_speakers,
+            keep_models=keep_models,
+            asr_config=asr_config,
         )
         self.chapterize(filter_low_engagement=filter_low_engagement)
         self.generate_subtitles(write_titles=write_titles)
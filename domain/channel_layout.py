@@ -0,0 +1,91 @@
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from core.config import CHANNEL_LAYOUT_PATH
+from model.streamer import ChannelLayout, StreamerBBox, StreamerDetectionResult
+
+
+def channel_key(info: dict) -> Optional[str]:
+    """Stable channel identifier from a yt-dlp info dict ('Youtube:UC...')."""
+    channel = info.get("channel_id") or info.get("uploader_id") or info.get("uploader")
+    if not channel:
+        return None
+    return f"{info.get('extractor_key') or info.get('extractor') or 'unknown'}:{channel}"
+
+
+class ChannelLayoutStore:
+    """
+    Persistent facecam layout per channel, stored as one JSON file:
+        {channel_id: {is_reaction, confidence, video_id, bounding_box, updated_at}}
+
+    Writes re-read the file and publish atomically, so concurrent jobs only
+    ever lose a racing update, never the whole file.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, dict]:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def get(self, channel_id: str) -> Optional[ChannelLayout]:
+        data = self._read().get(channel_id)
+        if not data:
+            return None
+        bbox = data.get("bounding_box")
+        return ChannelLayout(
+            channel_id=channel_id,
+            is_reaction=bool(data["is_reaction"]),
+            confidence=float(data["confidence"]),
+            video_id=data.get("video_id", ""),
+            bounding_box=StreamerBBox(**bbox) if bbox else None,
+            updated_at=float(data.get("updated_at", 0.0)),
+        )
+
+    def put(
+        self, channel_id: str, detection: StreamerDetectionResult, video_id: str
+    ) -> ChannelLayout:
+        """Records the layout detected on video_id as the channel's layout."""
+        layout = ChannelLayout(
+            channel_id=channel_id,
+            is_reaction=detection.is_reaction,
+            confidence=detection.confidence,
+            video_id=video_id,
+            bounding_box=detection.bounding_box,
+            updated_at=time.time(),
+        )
+        entry = asdict(layout)
+        entry.pop("channel_id")
+
+        with self._lock:
+            layouts = self._read()
+            layouts[channel_id] = entry
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f"{self.path.name}.{uuid.uuid4().hex}.tmp")
+            tmp.write_text(
+                json.dumps(layouts, ensure_ascii=False, indent=2), encoding="utf-8"
+            )
+            os.replace(tmp, self.path)
+        return layout
+
+
+# Global store instance (Singleton pattern)
+_CHANNEL_LAYOUTS: Optional[ChannelLayoutStore] = None
+
+
+def get_channel_layouts() -> ChannelLayoutStore:
+    """Returns the process-wide channel layout store."""
+    global _CHANNEL_LAYOUTS
+    if _CHANNEL_LAYOUTS is None:
+        _CHANNEL_LAYOUTS = ChannelLayoutStore(CHANNEL_LAYOUT_PATH)
+    return _CHANNEL_LAYOUTS
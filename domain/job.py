@@ -0,0 +1,126 @@
+import json
+import os
+import shutil
+import socket
+import time
+import uuid
+from pathlib import Path
+from typing import Optional, Union
+
+from domain.paths import Paths
+
+JOBS_DIR = "jobs"
+
+
+def lock_owner_alive(lock_file: Path) -> bool:
+    """True if the lock file belongs to a process that is still running."""
+    try:
+        owner = json.loads(lock_file.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return False
+
+    if owner.get("host") != socket.gethostname():
+        # Cannot check remote processes, assume alive
+        return True
+    try:
+        os.kill(int(owner["pid"]), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobContext:
+    """
+    Isolated workspace of a single pipeline job.
+
+    Mirrors the Paths API (get_audio_dir, get_video_dir, ...) but every
+    directory lives under <data>/jobs/<job_id>/, so several jobs can run on
+    one host. Services accept an optional JobContext and fall back to the
+    global Paths when none is given.
+    """
+
+    def __init__(
+        self,
+        job_id: Optional[str] = None,
+        base_dir: Optional[Union[str, Path]] = None,
+    ):
+        self.job_id = job_id or uuid.uuid4().hex[:12]
+        base = Path(base_dir) if base_dir is not None else Paths._root
+        self.root = base / JOBS_DIR / self.job_id
+
+    def __repr__(self) -> str:
+        return f"JobContext(job_id={self.job_id!r}, root={str(self.root)!r})"
+
+    def _ensure(self, path: Path) -> Path:
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def get_audio_dir(self) -> Path:
+        return self._ensure(self.root / Paths.AUDIO_DIR)
+
+    def get_transcript_dir(self) -> Path:
+        return self._ensure(self.root / Paths.TRANSCRIPTS_DIR)
+
+    def get_chapter_dir(self) -> Path:
+        return self._ensure(self.root / Paths.CHAPTERS_DIR)
+
+    def get_video_dir(self) -> Path:
+        return self._ensure(self.root / Paths.VIDEO_DIR)
+
+    def get_frame_dir(self) -> Path:
+        return self._ensure(self.root / Paths.FRAME_DIR)
+
+    def get_subtitle_dir(self) -> Path:
+        return self._ensure(self.root / Paths.SUBTITLES_DIR)
+
+    def get_short_output_dir(self) -> Path:
+        return self._ensure(self.root / Paths.SHORTS_DIR)
+
+    def get_info_dir(self) -> Path:
+        return self._ensure(self.root / Paths.INFO_DIR)
+
+    def get_final_dir(self) -> Path:
+        # Shared across jobs, file names are made job-unique instead
+        return Paths.get_final_dir()
+
+    def get_lock_file(self) -> Path:
+        return self.root / ".lock"
+
+    def final_name(self, file_name: str) -> str:
+        """Job-unique output name: '{stem}_{job_id}{suffix}'."""
+        path = Path(file_name)
+        return f"{path.stem}_{self.job_id}{path.suffix}"
+
+    def acquire(self) -> None:
+        """
+        Takes ownership of the workspace by atomically creating its lock file.
+        A stale lock left by a dead process on this host is taken over.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        lock_file = self.get_lock_file()
+        owner = json.dumps(
+            {"pid": os.getpid(), "host": socket.gethostname(), "started_at": time.time()}
+        )
+
+        for _ in range(2):
+            try:
+                fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if lock_owner_alive(lock_file):
+                    raise RuntimeError(f"Job {self.job_id} is already running.")
+                lock_file.unlink(missing_ok=True)
+                continue
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(owner)
+            return
+
+        raise RuntimeError(f"Could not acquire lock for job {self.job_id}.")
+
+    def release(self, remove_workspace: bool = False) -> None:
+        """Drops ownership and optionally deletes the job's intermediate files."""
+        self.get_lock_file().unlink(missing_ok=True)
+        if remove_workspace and self.root.exists():
+            shutil.rmtree(self.root, ignore_errors=True)
+
@@ -0,0 +1,216 @@
+import hashlib
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+
+from core.config import (
+    LLM_CACHE_DIR,
+    LLM_CACHE_MAX_MB,
+    LLM_CACHE_TTL_HOURS,
+    LLM_CACHE_BYPASS,
+)
+from model.llm_usage import LLMUsage
+from utils.llm_helper import read_usage
+
+
+def _hash_part(part: Any) -> str:
+    """Stable digest of one prompt part (text, bytes, inline Part or a PIL image)."""
+    digest = hashlib.sha256()
+    if isinstance(part, str):
+        digest.update(b"text:" + part.encode("utf-8"))
+    elif isinstance(part, (bytes, bytearray)):
+        digest.update(b"bytes:" + bytes(part))
+    elif getattr(part, "inline_data", None) is not None:
+        # types.Part.from_bytes (e.g. a JPEG frame): payload + mime type
+        blob = part.inline_data
+        digest.update(f"blob:{blob.mime_type}:".encode("utf-8"))
+        digest.update(blob.data or b"")
+    elif hasattr(part, "tobytes") and hasattr(part, "size"):
+        # PIL image: pixels + geometry, independent of the source file
+        digest.update(f"image:{part.mode}:{part.size}:".encode("utf-8"))
+        digest.update(part.tobytes())
+    else:
+        digest.update(b"repr:" + repr(part).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _config_dict(config: Any) -> Any:
+    """GenerateContentConfig (pydantic) or plain dict, as JSON-able data."""
+    if config is None:
+        return None
+    if hasattr(config, "model_dump"):
+        return config.model_dump(mode="json", exclude_none=True)
+    return config
+
+
+class LLMResponseCache:
+    """
+    On-disk cache of LLM text responses.
+
+    Entries are keyed by model + system prompt hash + content hash +
+    generation config and stored as <root>/<key[:2]>/<key>.json. Entries
+    older than ttl_seconds are ignored and deleted on read; the directory
+    is bounded by max_bytes with LRU eviction (mtime = last access).
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        max_bytes: int,
+        ttl_seconds: float = 0,
+    ):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def make_key(
+        model: str,
+        system_prompt: str,
+        contents: List[Any],
+        config: Any = None,
+    ) -> str:
+        payload = json.dumps(
+            {
+                "model": model,
+                "system_prompt": _hash_part(system_prompt),
+                "contents": [_hash_part(c) for c in contents],
+                "config": _config_dict(config),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:40]
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        """Returns the cached entry {text, model, *_tokens, created_at} or None."""
+        if not self.enabled:
+            return None
+
+        path = self._entry_path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if self.ttl_seconds > 0 and time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            path.unlink(missing_ok=True)
+            return None
+
+        # Touch for LRU bookkeeping
+        os.utime(path)
+        return entry
+
+    def put(self, key: str, text: str, usage: Optional[LLMUsage] = None) -> None:
+        """Saves a response, then enforces the disk budget."""
+        if not self.enabled:
+            return
+
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "text": text,
+            "model": usage.model if usage else None,
+            "input_tokens": usage.input_tokens if usage else 0,
+            "output_tokens": usage.output_tokens if usage else 0,
+            "created_at": time.time(),
+        }
+        tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        # Atomic publish so concurrent jobs never read half-written entries
+        os.replace(tmp, path)
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Deletes least recently used entries until the cache fits max_bytes."""
+        if not self.enabled or not self.root.exists():
+            return
+
+        entries = []
+        total = 0
+        for path in self.root.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def generate_content(
+    client,
+    model: str,
+    system_prompt: str,
+    contents: List[Any],
+    config: Any = None,
+    label: str = "llm",
+    cache: Optional[LLMResponseCache] = None,
+    use_cache: bool = True,
+) -> Tuple[str, LLMUsage]:
+    """
+    client.models.generate_content with response caching.
+
+    Any object exposing models.generate_content(model=, contents=, config=)
+    works as client, so a local fake can stand in for google-genai.
+
+    Args:
+        use_cache: False bypasses the cache for this call (the fresh
+            response is still stored).
+
+    Returns:
+        (response text, usage); a cache hit reports zero tokens.
+    """
+    cache = cache or get_llm_cache()
+    key = cache.make_key(model, system_prompt, contents, config)
+
+    if use_cache and not LLM_CACHE_BYPASS:
+        entry = cache.get(key)
+        if entry is not None:
+            print(f"-> LLM cache hit: {label}")
+            return entry["text"], LLMUsage(label=label, model=model, cached=True)
+
+    started = time.perf_counter()
+    response = client.models.generate_content(
+        model=model,
+        contents=[system_prompt, *contents],
+        config=config,
+    )
+    usage = read_usage(response, label, model, time.perf_counter() - started)
+
+    # Empty (e.g. blocked) responses are not worth replaying
+    if response.text:
+        cache.put(key, response.text, usage)
+    return response.text, usage
+
+
+# Global cache instance (Singleton pattern)
+_LLM_CACHE: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Returns the process-wide LLM response cache."""
+    global _LLM_CACHE
+    if _LLM_CACHE is None:
+        _LLM_CACHE = LLMResponseCache(
+            root=LLM_CACHE_DIR,
+            max_bytes=int(LLM_CACHE_MAX_MB * 1024**2),
+            ttl_seconds=LLM_CACHE_TTL_HOURS * 3600,
+        )
+    return _LLM_CACHE
@@ -0,0 +1,173 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+import httpx
+from google import genai
+from google.genai import errors, types
+
+from core.config import (
+    GEMINI_API_KEY,
+    LLM_TIMEOUT_SECONDS,
+    LLM_MAX_RETRIES,
+    LLM_BACKOFF_SECONDS,
+)
+from domain.llm_cache import LLMResponseCache, generate_content, get_llm_cache
+from model.llm_usage import LLMUsage
+from utils.llm_helper import extract_json
+
+# HTTP status codes worth retrying; other 4xx errors are permanent
+_RETRYABLE_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class LLMResponseError(ValueError):
+    """The model answered, but with empty, non-JSON or off-schema output."""
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, LLMResponseError):
+        # Malformed or truncated output: ask again
+        return True
+    if isinstance(error, errors.APIError):
+        return error.code in _RETRYABLE_CODES
+    # Network-level failures (connection reset, DNS, timeouts)
+    return isinstance(error, (httpx.TransportError, ConnectionError, TimeoutError))
+
+
+class LLMGateway:
+    """
+    Single entry point for Gemini calls.
+
+    Holds one pooled client for the whole process (its HTTP connections are
+    reused across calls and threads), routes requests through the response
+    cache and retries transient failures with exponential backoff.
+    Pass any object exposing models.generate_content as client to run
+    against a local stand-in.
+    """
+
+    def __init__(
+        self,
+        client: Any = None,
+        api_key: Optional[str] = GEMINI_API_KEY,
+        cache: Optional[LLMResponseCache] = None,
+        timeout_seconds: float = LLM_TIMEOUT_SECONDS,
+        max_retries: int = LLM_MAX_RETRIES,
+        backoff_seconds: float = LLM_BACKOFF_SECONDS,
+    ):
+        self._client = client
+        self.api_key = api_key
+        self.cache = cache
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        """The shared client, created on first use."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    if not self.api_key:
+                        raise RuntimeError("GEMINI_API_KEY is not set")
+                    self._client = genai.Client(
+                        api_key=self.api_key,
+                        http_options=types.HttpOptions(
+                            timeout=int(self.timeout_seconds * 1000)
+                        ),
+                    )
+        return self._client
+
+    def _sleep_before_retry(self, attempt: int, label: str, error: Exception) -> None:
+        delay = self.backoff_seconds * (2**attempt)
+        delay += random.uniform(0, delay / 2)
+        print(
+            f"Warning: {label} attempt {attempt + 1} failed ({error}), "
+            f"retrying in {delay:.1f}s..."
+        )
+        time.sleep(delay)
+
+    def generate_json(
+        self,
+        model: str,
+        system_prompt: str,
+        contents: List[Any],
+        temperature: float,
+        schema: Optional[dict] = None,
+        label: str = "llm",
+        use_cache: bool = True,
+        parse: Optional[Callable[[dict], Any]] = None,
+    ) -> Tuple[Any, LLMUsage]:
+        """
+        Requests a JSON response, constrained to `schema` when given.
+
+        Retryable API errors (408/429/5xx), network failures and output that
+        is not valid JSON or that `parse` rejects are retried up to
+        max_retries times; a retry skips the cache. Any other exception is
+        raised immediately.
+
+        Returns:
+            (parse(data) or the raw dict, usage)
+        """
+        config = types.GenerateContentConfig(
+            temperature=temperature,
+            response_mime_type="application/json",
+            response_schema=schema,
+        )
+
+        client = self.client
+        attempt = 0
+        while True:
+            try:
+                text, usage = generate_content(
+                    client,
+                    model=model,
+                    system_prompt=system_prompt,
+                    contents=contents,
+                    config=config,
+                    label=label,
+                    cache=self.cache or get_llm_cache(),
+                    use_cache=use_cache,
+                )
+                if not text:
+                    raise LLMResponseError("Empty response")
+                try:
+                    data = extract_json(text)
+                    return (parse(data) if parse else data), usage
+                except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+                    raise LLMResponseError(f"Unusable response: {e!r}") from e
+            except Exception as e:
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    raise
+                self._sleep_before_retry(attempt, label, e)
+                attempt += 1
+                # Never replay a cached answer that just failed to parse
+                use_cache = False
+
+    async def agenerate_json(self, *args, **kwargs) -> Tuple[Any, LLMUsage]:
+        """
+        Async generate_json; independent calls can be awaited together
+        (e.g. with asyncio.gather) and share the pooled client.
+        """
+        return await asyncio.to_thread(self.generate_json, *args, **kwargs)
+
+
+# Global gateway instance (Singleton pattern)
+_LLM_GATEWAY: Optional[LLMGateway] = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Returns the process-wide LLM gateway."""
+    global _LLM_GATEWAY
+    if _LLM_GATEWAY is None:
+        _LLM_GATEWAY = LLMGateway()
+    return _LLM_GATEWAY
+
+
+def set_llm_gateway(gateway: Optional[LLMGateway]) -> None:
+    """Replaces the process-wide gateway (e.g. with a local stand-in); None resets it."""
+    global _LLM_GATEWAY
+    _LLM_GATEWAY = gateway
@@ -0,0 +1,211 @@
+import json
+import os
+import subprocess
+import threading
+import uuid
+from pathlib import Path
+from statistics import median
+from typing import Dict, List, Optional, Tuple, Union
+
+from model.media_info import AudioStreamInfo, MediaInfo, VideoStreamInfo
+
+SIDECAR_SUFFIX = ".probe.json"
+# Packets read from the start of the file to measure the keyframe interval
+KEYFRAME_PROBE_SECONDS = 30
+
+# (size, mtime_ns): a file rewritten in place invalidates its entry
+FileStamp = Tuple[int, int]
+
+
+def _stamp(path: Path) -> FileStamp:
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _number(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _kbps(value) -> Optional[float]:
+    bits = _number(value)
+    return round(bits / 1000, 1) if bits else None
+
+
+def _fps(rate: Optional[str]) -> Optional[float]:
+    """'30000/1001' -> 29.97"""
+    if not rate or "/" not in rate:
+        return _number(rate)
+    num, den = rate.split("/", 1)
+    num, den = _number(num), _number(den)
+    return round(num / den, 3) if num and den else None
+
+
+def _keyframe_interval(packets: List[dict], stream_index: int) -> Optional[float]:
+    times = [
+        float(p["pts_time"])
+        for p in packets
+        if p.get("stream_index") == stream_index
+        and "K" in p.get("flags", "")
+        and _number(p.get("pts_time")) is not None
+    ]
+    gaps = [b - a for a, b in zip(times, times[1:]) if b > a]
+    return round(median(gaps), 3) if gaps else None
+
+
+def parse_probe(data: dict) -> MediaInfo:
+    """MediaInfo from the JSON output of run_ffprobe."""
+    streams = data.get("streams", [])
+    fmt = data.get("format", {})
+    v = next((s for s in streams if s.get("codec_type") == "video"), None)
+    a = next((s for s in streams if s.get("codec_type") == "audio"), None)
+
+    video = None
+    if v is not None:
+        video = VideoStreamInfo(
+            width=int(v["width"]),
+            height=int(v["height"]),
+            codec=v.get("codec_name"),
+            fps=_fps(v.get("avg_frame_rate")) or _fps(v.get("r_frame_rate")),
+            pix_fmt=v.get("pix_fmt"),
+            bitrate=_kbps(v.get("bit_rate")),
+        )
+
+    audio = None
+    if a is not None:
+        sample_rate = _number(a.get("sample_rate"))
+        audio = AudioStreamInfo(
+            codec=a.get("codec_name"),
+            sample_rate=int(sample_rate) if sample_rate else None,
+            channels=a.get("channels"),
+            bitrate=_kbps(a.get("bit_rate")),
+        )
+
+    duration = _number(fmt.get("duration")) or _number((v or a or {}).get("duration"))
+    return MediaInfo(
+        duration=duration or 0.0,
+        format_name=fmt.get("format_name"),
+        bitrate=_kbps(fmt.get("bit_rate")),
+        video=video,
+        audio=audio,
+        keyframe_interval=(
+            _keyframe_interval(data.get("packets", []), v["index"]) if v else None
+        ),
+        start_time=_number(fmt.get("start_time")) or 0.0,
+    )
+
+
+def run_ffprobe(path: Path) -> MediaInfo:
+    """One ffprobe call: format, all streams and the first packets' keyframe flags."""
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-show_format",
+        "-show_streams",
+        "-show_entries",
+        "packet=stream_index,pts_time,flags",
+        "-read_intervals",
+        f"%+{KEYFRAME_PROBE_SECONDS}",
+        "-of",
+        "json",
+        str(path),
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    return parse_probe(json.loads(result.stdout))
+
+
+class MediaProbeCache:
+    """
+    MediaInfo per file, probed at most once.
+
+    Entries live in memory for the process and, when a sidecar_dir is
+    given, as '<file name>.probe.json' there, so other processes using the
+    same dir skip the probe too. A job's info dir is removed with its
+    workspace, so its sidecars only last for that job. Both are keyed by
+    size + mtime.
+    Derived files (cuts, crops, renders) can be registered with
+    `remember` instead of being probed.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Path, Tuple[FileStamp, MediaInfo]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _sidecar_path(path: Path, sidecar_dir: Path) -> Path:
+        return sidecar_dir / f"{path.name}{SIDECAR_SUFFIX}"
+
+    def _read_sidecar(
+        self, path: Path, stamp: FileStamp, sidecar_dir: Path
+    ) -> Optional[MediaInfo]:
+        try:
+            sidecar = self._sidecar_path(path, sidecar_dir)
+            data = json.loads(sidecar.read_text(encoding="utf-8"))
+            if data["path"] != str(path) or tuple(data["stamp"]) != stamp:
+                return None
+            return MediaInfo.from_dict(data["info"])
+        except (FileNotFoundError, KeyError, TypeError, json.JSONDecodeError):
+            return None
+
+    def _write_sidecar(
+        self, path: Path, stamp: FileStamp, info: MediaInfo, sidecar_dir: Path
+    ) -> None:
+        sidecar = self._sidecar_path(path, sidecar_dir)
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        tmp = sidecar.with_name(f"{sidecar.name}.{uuid.uuid4().hex}.tmp")
+        tmp.write_text(
+            json.dumps({"path": str(path), "stamp": stamp, "info": info.to_dict()}),
+            encoding="utf-8",
+        )
+        os.replace(tmp, sidecar)
+
+    def probe(
+        self, path: Union[str, Path], sidecar_dir: Optional[Path] = None
+    ) -> MediaInfo:
+        path = Path(path).resolve()
+        stamp = _stamp(path)
+
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+
+        info = self._read_sidecar(path, stamp, sidecar_dir) if sidecar_dir else None
+        if info is None:
+            info = run_ffprobe(path)
+            if sidecar_dir:
+                self._write_sidecar(path, stamp, info, sidecar_dir)
+
+        with self._lock:
+            self._entries[path] = (stamp, info)
+        return info
+
+    def remember(self, path: Union[str, Path], info: MediaInfo) -> None:
+        """Registers known info for a file (e.g. one just rendered from a probed source)."""
+        path = Path(path).resolve()
+        try:
+            stamp = _stamp(path)
+        except FileNotFoundError:
+            return
+        with self._lock:
+            self._entries[path] = (stamp, info)
+
+
+# Global cache instance (Singleton pattern)
+_MEDIA_PROBE: Optional[MediaProbeCache] = None
+
+
+def get_media_probe() -> MediaProbeCache:
+    """Returns the process-wide media probe cache."""
+    global _MEDIA_PROBE
+    if _MEDIA_PROBE is None:
+        _MEDIA_PROBE = MediaProbeCache()
+    return _MEDIA_PROBE
+
+
+def probe_media(path: Union[str, Path], sidecar_dir: Optional[Path] = None) -> MediaInfo:
+    """Cached MediaInfo of a file (see MediaProbeCache)."""
+    return get_media_probe().probe(path, sidecar_dir=sidecar_dir)
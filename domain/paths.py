@@ -11,6 +11,7 @@ from core.config import (
     SUBTITLE_DIR,
     SHORT_DIR,
     FINAL_DIR,
+    INFO_DIR,
 )
 
 
@@ -29,6 +30,7 @@ class Paths:
     SUBTITLES_DIR = SUBTITLE_DIR
     SHORTS_DIR = SHORT_DIR
     FINAL_DIR = FINAL_DIR
+    INFO_DIR = INFO_DIR
 
     @classmethod
     def configure(cls, new_base_dir: Union[str, Path]) -> None:
@@ -72,6 +74,10 @@ class Paths:
     def get_short_output_dir(cls) -> Path:
         return cls._ensure(cls._root / cls.SHORTS_DIR)
 
+    @classmethod
+    def get_info_dir(cls) -> Path:
+        return cls._ensure(cls._root / cls.INFO_DIR)
+
     @classmethod
     def get_final_dir(cls) -> Path:
         return cls._ensure(Path.cwd().parent / cls.FINAL_DIR)
@@ -1,11 +1,45 @@
 import subprocess
-import json
+from dataclasses import replace
 from pathlib import Path
 from enum import Enum, auto
-from typing import Union, Optional
-from model.streamer import StreamerBBox
-from service.detect_streamer import detect_streamer
-from utils.extract_frames import extract_frames
+from typing import List, Tuple, Union, Optional
+from domain.job import JobContext
+from domain.channel_layout import get_channel_layouts
+from domain.media_probe import get_media_probe, probe_media
+from domain.paths import Paths
+from model.media_info import MediaInfo
+from model.streamer import StreamerBBox, StreamerDetectionResult
+from core.config import (
+    CHANNEL_LAYOUT_CACHE,
+    CHANNEL_LAYOUT_MIN_COVERAGE,
+    CHANNEL_LAYOUT_VERIFY_FRAMES,
+    FRAME_SAMPLE_WIDTH,
+    STREAMER_LOCAL_DETECTION,
+    STREAMER_LOCAL_FRAMES,
+    STREAMER_LOCAL_MIN_CONFIDENCE,
+)
+from service.detect_streamer import detect_streamer, load_cached_detection, store_detection
+from service.detect_streamer_local import (
+    ANALYSIS_HEIGHT,
+    ANALYSIS_WIDTH,
+    detect_streamer_local,
+    layout_coverage,
+)
+from utils.crop_layout import plan_vertical_layout, layout_filter
+from utils.extract_frames import (
+    sample_frames,
+    sample_timestamps,
+    to_gray,
+)
+
+
+# (start_time, end_time, subtitle_path, output_path) of one short, source timeline
+ShortClip = Tuple[float, float, Path, Path]
+
+
+def _thread_args(threads: Optional[int]) -> list[str]:
+    """ffmpeg output options capping encoder/filter threads (None = ffmpeg default)."""
+    return ["-threads", str(threads)] if threads else []
 
 
 class VideoType(Enum):
@@ -23,12 +57,22 @@ class Video:
         video_type: VideoType = VideoType.ORIGINAL,
         aspect_ratio: Optional[tuple[int, int]] = None,  # (width, height)
         streamer_bbox: Optional[StreamerBBox] = None,
+        job: Optional[JobContext] = None,
+        media_info: Optional[MediaInfo] = None,
+        streamer_detected: bool = False,
     ):
         self.path = Path(path)
         self.video_type = video_type
         self._aspect_ratio = aspect_ratio
         self._name: Optional[str] = None
         self.streamer_bbox = streamer_bbox
+        # streamer_bbox=None also means "no facecam" once detection ran
+        self.streamer_detected = streamer_detected or streamer_bbox is not None
+        self.job = job
+        self._media_info = media_info
+        if media_info is not None:
+            # Derived from a probed video: later lookups of this file skip ffprobe
+            get_media_probe().remember(self.path, media_info)
 
     @property
     def name(self) -> str:
@@ -41,6 +85,22 @@ class Video:
         self._name = self.path.stem
         return self._name
 
+    @property
+    def media_info(self) -> MediaInfo:
+        """
+        Probed stream/container info, cached in memory and as a sidecar in
+        the info dir (one ffprobe per file at most).
+        """
+        if self._media_info is None:
+            self._media_info = probe_media(
+                self.path, sidecar_dir=(self.job or Paths).get_info_dir()
+            )
+        return self._media_info
+
+    @property
+    def duration(self) -> float:
+        return self.media_info.duration
+
     @property
     def resolution(self) -> tuple[int, int]:
         """
@@ -49,37 +109,55 @@ class Video:
         if self._aspect_ratio:
             return self._aspect_ratio
 
-        cmd = [
-            "ffprobe",
-            "-v",
-            "error",
-            "-select_streams",
-            "v:0",
-            "-show_entries",
-            "stream=width,height",
-            "-of",
-            "json",
-            str(self.path),
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        info = json.loads(result.stdout)
-        stream = info["streams"][0]
-
-        self._aspect_ratio = (stream["width"], stream["height"])
+        self._aspect_ratio = self.media_info.resolution
         return self._aspect_ratio
 
+    def _derived_info(self, **changes) -> Optional[MediaInfo]:
+        """Info of a file made from this video (None if it was never probed)."""
+        if self._media_info is None:
+            return None
+        return self._media_info.derive(**changes)
+
+    def _merged_info(
+        self, audio_path: Optional[Path], audio_codec: str, **changes
+    ) -> Optional[MediaInfo]:
+        """
+        Info of a file made from this video with audio_path's first audio
+        stream muxed in (this video's own audio if audio_path is None),
+        encoded with audio_codec. None = unknown, the output gets probed
+        on first use.
+        """
+        if self._media_info is None:
+            return None
+        if audio_path is None:
+            audio = self._media_info.audio
+        else:
+            audio = probe_media(
+                audio_path, sidecar_dir=(self.job or Paths).get_info_dir()
+            ).audio
+            if audio is None:
+                return None
+        if audio is not None and audio_codec != "copy":
+            audio = replace(audio, codec=audio_codec, bitrate=None)
+        return self._derived_info(audio=audio, **changes)
+
     def add_audio(
-        self, audio_path: Union[str, Path], output_path: Union[str, Path]
+        self,
+        audio_path: Union[str, Path],
+        output_path: Union[str, Path],
+        audio_codec: str = "aac",
     ) -> "Video":
-        """Merges video with external audio using AAC encoding."""
+        """
+        Merges video with external audio using AAC encoding
+        (audio_codec="copy" keeps an already MP4-compatible stream).
+        """
         audio_path = Path(audio_path)
         output_path = Path(output_path)
 
         if not audio_path.exists():
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
 
-        if self.streamer_bbox is None:
-            self.streamer_bbox = self.get_streamer_bbox()
+        self.detect_streamer_once()
 
         cmd = [
             "ffmpeg",
@@ -91,7 +169,7 @@ class Video:
             "-c:v",
             "copy",
             "-c:a",
-            "aac",
+            audio_codec,
             "-map",
             "0:v:0",
             "-map",
@@ -106,6 +184,9 @@ class Video:
             video_type=VideoType.ORIGINAL,
             aspect_ratio=self._aspect_ratio,
             streamer_bbox=self.streamer_bbox,
+            streamer_detected=self.streamer_detected,
+            job=self.job,
+            media_info=self._merged_info(audio_path, audio_codec),
         )
 
     def extract_subclip(
@@ -135,13 +216,109 @@ class Video:
             video_type=VideoType.SUBCLIP,
             aspect_ratio=self._aspect_ratio,
             streamer_bbox=self.streamer_bbox,
+            streamer_detected=self.streamer_detected,
+            job=self.job,
+            media_info=self._derived_info(duration=end_time - start_time),
         )
 
-    def get_streamer_bbox(self) -> Optional[StreamerBBox]:
-        """Detects streamer bounding box using Gemini model."""
+    def sample_frames(self, frame_count: int, width: int = FRAME_SAMPLE_WIDTH):
+        """
+        frame_count RGB frames spread evenly over the video, scaled to
+        `width` (aspect ratio kept), decoded in memory by one ffmpeg call.
+        """
+        source_width, source_height = self.resolution
+        height = max(2, round(width * source_height / source_width / 2) * 2)
+        timestamps = sample_timestamps(self.duration, frame_count)
+        return sample_frames(self.path, timestamps, width, height)
+
+    def _verify_channel_layout(
+        self, channel_id: str
+    ) -> Optional[StreamerDetectionResult]:
+        """The channel's known layout, if it still matches a few sampled frames."""
+        layout = get_channel_layouts().get(channel_id)
+        if layout is None:
+            return None
+
+        frames = self.sample_frames(CHANNEL_LAYOUT_VERIFY_FRAMES)
+        coverage = layout_coverage(
+            to_gray(frames, ANALYSIS_WIDTH, ANALYSIS_HEIGHT), layout.bounding_box
+        )
+        if coverage < CHANNEL_LAYOUT_MIN_COVERAGE:
+            print(
+                f"-> Channel layout of {channel_id} no longer matches "
+                f"(coverage {coverage:.2f}), re-detecting..."
+            )
+            return None
+
+        return StreamerDetectionResult(
+            is_reaction=layout.is_reaction,
+            confidence=layout.confidence,
+            reason=(
+                f"channel layout from {layout.video_id} "
+                f"(verified, coverage {coverage:.2f})"
+            ),
+            bounding_box=layout.bounding_box,
+        )
+
+    def detect_streamer_once(
+        self, channel_id: Optional[str] = None
+    ) -> Optional[StreamerBBox]:
+        """
+        Runs get_streamer_bbox unless detection already ran for this video
+        (a None bbox afterwards means "no facecam", not "unknown").
+        """
+        if not self.streamer_detected:
+            self.streamer_bbox = self.get_streamer_bbox(channel_id=channel_id)
+            self.streamer_detected = True
+        return self.streamer_bbox
+
+    def get_streamer_bbox(
+        self, channel_id: Optional[str] = None
+    ) -> Optional[StreamerBBox]:
+        """
+        Detects streamer bounding box.
 
-        frames = extract_frames(video_path=self.path, frame_count=2)
-        streamer_detection = detect_streamer(frames)
+        With channel_id, the channel's known layout is reused when a cheap
+        check on CHANNEL_LAYOUT_VERIFY_FRAMES frames confirms it. Otherwise
+        the local detector runs first; Gemini is only asked when its
+        confidence is below STREAMER_LOCAL_MIN_CONFIDENCE. Both work on
+        the same in-memory frame sample.
+        """
+        video_id = self.name.split(".")[0]
+
+        streamer_detection = load_cached_detection(video_id, job=self.job)
+        if streamer_detection is not None:
+            print(f"Streamer Detection: {streamer_detection}")
+            return streamer_detection.bounding_box
+
+        use_channel = CHANNEL_LAYOUT_CACHE and channel_id is not None
+        if use_channel:
+            streamer_detection = self._verify_channel_layout(channel_id)
+            if streamer_detection is not None:
+                store_detection(streamer_detection, video_id, job=self.job)
+                print(f"Streamer Detection: {streamer_detection}")
+                return streamer_detection.bounding_box
+
+        frames = self.sample_frames(
+            STREAMER_LOCAL_FRAMES if STREAMER_LOCAL_DETECTION else 2
+        )
+        if STREAMER_LOCAL_DETECTION:
+            local_detection = detect_streamer_local(
+                to_gray(frames, ANALYSIS_WIDTH, ANALYSIS_HEIGHT)
+            )
+            print(f"Local Streamer Detection: {local_detection}")
+            if local_detection.confidence >= STREAMER_LOCAL_MIN_CONFIDENCE:
+                streamer_detection = local_detection
+                store_detection(streamer_detection, video_id, job=self.job)
+        if streamer_detection is None:
+            # Two frames from the middle third of the sample are enough for Gemini
+            n = len(frames)
+            picks = frames[[n // 3, (2 * n) // 3]] if n > 2 else frames
+            streamer_detection = detect_streamer(
+                list(picks), video_id=video_id, job=self.job
+            )
+        if use_channel:
+            get_channel_layouts().put(channel_id, streamer_detection, video_id)
         print(f"Streamer Detection: {streamer_detection}")
         return streamer_detection.bounding_box
 
@@ -151,6 +328,7 @@ class Video:
         target_width: int = 1080,
         target_height: int = 1920,
         streamer_aspect_ratio: float = 6 / 16,
+        threads: Optional[int] = None,
     ) -> "Video":
         """
         Smartly crops the video to vertical format with split-screen support.
@@ -159,13 +337,11 @@ class Video:
         - Calculates split heights based on 6/16 (Top) and 10/16 (Bottom) ratios.
         - Streamer Crop: Uses 'Crop to Fill' strategy inside the BBox to avoid stretching.
         - Content Crop: Standard center crop to fill the bottom area.
+        (See utils.crop_layout.plan_vertical_layout)
         """
         output_path = Path(output_path)
         source_w, source_h = self.resolution
 
-        top_height = int(target_height * (streamer_aspect_ratio))
-        bottom_height = target_height - top_height
-
         # --- CASE 1: No Streamer (Standard Center Crop) ---
         if self.streamer_bbox is None:
             print("No streamer detected, performing standard center crop.")
@@ -173,76 +349,20 @@ class Video:
                 output_path=output_path,
                 target_width=target_width,
                 target_height=target_height,
+                threads=threads,
             )
 
         print("Streamer detected, performing smart vertical crop.")
 
-        # --- PART A: Top (Streamer) - "Crop to Fill" Logic ---
-        # We treat the BBox as the source video and target_width x top_height as the destination.
-
-        # 1. Get BBox dimensions in pixels
-        bbox_x = self.streamer_bbox.x * source_w
-        bbox_y = self.streamer_bbox.y * source_h
-        bbox_w = self.streamer_bbox.width * source_w
-        bbox_h = self.streamer_bbox.height * source_h
-
-        # 2. Calculate Aspect Ratios
-        target_top_ratio = target_width / top_height
-        current_bbox_ratio = bbox_w / bbox_h
-
-        # 3. Determine Crop Dimensions (inside the BBox)
-        if current_bbox_ratio > target_top_ratio:
-            # BBox is wider than target slot -> Crop sides (preserve height)
-            crop_h = bbox_h
-            crop_w = bbox_h * target_top_ratio
-        else:
-            # BBox is taller than target slot -> Crop top/bottom (preserve width)
-            crop_w = bbox_w
-            crop_h = bbox_w / target_top_ratio
-
-        # 4. Center the crop within the BBox
-        # Center X of BBox = bbox_x + (bbox_w / 2)
-        # Top-Left X of Crop = Center X - (crop_w / 2)
-        crop_x = (bbox_x + (bbox_w / 2)) - (crop_w / 2)
-        crop_y = (bbox_y + (bbox_h / 2)) - (crop_h / 2)
-
-        # 5. Create Filter String (Crop -> Scale)
-        # We cast to int() for FFmpeg
-        top_filter = (
-            f"crop={int(crop_w)}:{int(crop_h)}:{int(crop_x)}:{int(crop_y)},"
-            f"scale={target_width}:{top_height}"
-        )
-
-        # --- PART B: Bottom (Content) - "Crop to Fill" Logic ---
-        # Target is target_width x bottom_height
-
-        target_bottom_ratio = target_width / bottom_height
-        current_video_ratio = source_w / source_h
-
-        if current_video_ratio > target_bottom_ratio:
-            # Video is wider -> Crop sides
-            g_crop_h = source_h
-            g_crop_w = source_h * target_bottom_ratio
-            g_crop_x = (source_w - g_crop_w) / 2
-            g_crop_y = 0
-        else:
-            # Video is taller -> Crop top/bottom
-            g_crop_w = source_w
-            g_crop_h = source_w / target_bottom_ratio
-            g_crop_x = 0
-            g_crop_y = (source_h - g_crop_h) / 2
-
-        content_filter = (
-            f"crop={int(g_crop_w)}:{int(g_crop_h)}:{int(g_crop_x)}:{int(g_crop_y)},"
-            f"scale={target_width}:{bottom_height}"
-        )
-
-        # --- PART C: Combine ---
-        filter_complex = (
-            f"[0:v]{top_filter}[top];"
-            f"[0:v]{content_filter}[bottom];"
-            f"[top][bottom]vstack=inputs=2"
+        rects = plan_vertical_layout(
+            source_w=source_w,
+            source_h=source_h,
+            streamer_bbox=self.streamer_bbox,
+            target_width=target_width,
+            target_height=target_height,
+            streamer_aspect_ratio=streamer_aspect_ratio,
         )
+        filter_complex = layout_filter(rects, input_label="0:v", output_label="v")
 
         cmd = [
             "ffmpeg",
@@ -251,6 +371,10 @@ class Video:
             str(self.path),
             "-filter_complex",
             filter_complex,
+            "-map",
+            "[v]",
+            "-map",
+            "0:a?",
             "-c:v",
             "libx264",
             "-preset",
@@ -261,6 +385,7 @@ class Video:
             "yuv420p",
             "-c:a",
             "copy",
+            *_thread_args(threads),
             str(output_path),
         ]
 
@@ -270,6 +395,10 @@ class Video:
             path=output_path,
             video_type=VideoType.CROPPED,
             aspect_ratio=(target_width, target_height),
+            job=self.job,
+            media_info=self._derived_info(
+                width=target_width, height=target_height, codec="h264"
+            ),
         )
 
     def resize_with_crop(
@@ -277,6 +406,7 @@ class Video:
         output_path: Union[str, Path],
         target_width: int = 1080,
         target_height: int = 1920,
+        threads: Optional[int] = None,
     ) -> "Video":
         """Resizes video to target resolution, cropping center if necessary."""
         output_path = Path(output_path)
@@ -317,13 +447,17 @@ class Video:
                 "copy",
             ]
 
-        full_cmd = base_cmd + filter_cmd + [str(output_path)]
+        full_cmd = base_cmd + filter_cmd + _thread_args(threads) + [str(output_path)]
         subprocess.run(full_cmd, check=True)
 
         return Video(
             path=output_path,
             video_type=VideoType.CROPPED,
             aspect_ratio=(target_width, target_height),
+            job=self.job,
+            media_info=self._derived_info(
+                width=target_width, height=target_height, codec="h264"
+            ),
         )
 
     def burn_in_subtitle(
@@ -333,6 +467,7 @@ class Video:
         crf: int = 18,
         preset: str = "slow",
         fonts_dir: str = "assets/fonts",
+        threads: Optional[int] = None,
     ) -> "Video":
         """Burns .ass subtitles into video (Re-encodes video)."""
         subtitle_path = Path(subtitle_path)
@@ -366,6 +501,7 @@ class Video:
             "+faststart",
             "-c:a",
             "copy",
+            *_thread_args(threads),
             str(output_path),
         ]
 
@@ -375,4 +511,249 @@ class Video:
             path=output_path,
             video_type=VideoType.FINAL,
             aspect_ratio=self._aspect_ratio,
+            job=self.job,
+            media_info=self._derived_info(codec="h264"),
+        )
+
+    def render_short(
+        self,
+        start_time: float,
+        end_time: float,
+        subtitle_path: Union[str, Path],
+        output_path: Union[str, Path],
+        audio_path: Optional[Union[str, Path]] = None,
+        target_width: int = 1080,
+        target_height: int = 1920,
+        streamer_aspect_ratio: float = 6 / 16,
+        crf: int = 18,
+        preset: str = "slow",
+        fonts_dir: str = "assets/fonts",
+        threads: Optional[int] = None,
+        audio_codec: str = "aac",
+        source_offset: float = 0.0,
+    ) -> "Video":
+        """
+        Renders a final vertical short in a single ffmpeg job.
+
+        Seeks into the original video (and external audio), then crops,
+        scales, stacks, burns in .ass subtitles and encodes once.
+        Equivalent to add_audio -> extract_subclip -> smart_vertical_crop
+        -> burn_in_subtitle without the intermediate files.
+        audio_codec="copy" skips the audio re-encode for AAC sources.
+
+        start_time/end_time are on the source timeline; source_offset is
+        where this file starts on it (non-zero for downloaded sections).
+        The external audio always covers the full source.
+        """
+        subtitle_path = Path(subtitle_path)
+        output_path = Path(output_path)
+
+        if not subtitle_path.exists():
+            raise FileNotFoundError(f"Subtitle file not found: {subtitle_path}")
+
+        if audio_path is not None:
+            audio_path = Path(audio_path)
+            if not audio_path.exists():
+                raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        source_w, source_h = self.resolution
+        rects = plan_vertical_layout(
+            source_w=source_w,
+            source_h=source_h,
+            streamer_bbox=self.streamer_bbox,
+            target_width=target_width,
+            target_height=target_height,
+            streamer_aspect_ratio=streamer_aspect_ratio,
+        )
+
+        filter_complex = (
+            layout_filter(rects, input_label="0:v", output_label="stacked")
+            + f";[stacked]ass='{str(subtitle_path)}':fontsdir='{fonts_dir}'[v]"
+        )
+
+        duration = end_time - start_time
+
+        # Input-side seeking resets timestamps to 0, which matches the
+        # clip-relative timing of the generated subtitles.
+        video_start = max(0.0, start_time - source_offset)
+        cmd = ["ffmpeg", "-y", "-ss", str(video_start), "-t", str(duration)]
+        cmd += ["-i", str(self.path)]
+        if audio_path is not None:
+            cmd += ["-ss", str(start_time), "-t", str(duration)]
+            cmd += ["-i", str(audio_path)]
+            audio_map = "1:a:0"
+        else:
+            audio_map = "0:a?"
+
+        cmd += [
+            "-filter_complex",
+            filter_complex,
+            "-map",
+            "[v]",
+            "-map",
+            audio_map,
+            "-c:v",
+            "libx264",
+            "-crf",
+            str(crf),
+            "-preset",
+            preset,
+            "-pix_fmt",
+            "yuv420p",
+            "-profile:v",
+            "high",
+            "-level",
+            "4.2",
+            "-movflags",
+            "+faststart",
+            "-c:a",
+            audio_codec,
+            *_thread_args(threads),
+            str(output_path),
+        ]
+
+        subprocess.run(cmd, check=True)
+
+        return Video(
+            path=output_path,
+            video_type=VideoType.FINAL,
+            aspect_ratio=(target_width, target_height),
+            job=self.job,
+            media_info=self._merged_info(
+                audio_path,
+                audio_codec,
+                duration=duration,
+                width=target_width,
+                height=target_height,
+                codec="h264",
+            ),
         )
+
+    def render_shorts_batch(
+        self,
+        clips: List[ShortClip],
+        audio_path: Optional[Union[str, Path]] = None,
+        target_width: int = 1080,
+        target_height: int = 1920,
+        streamer_aspect_ratio: float = 6 / 16,
+        crf: int = 18,
+        preset: str = "slow",
+        fonts_dir: str = "assets/fonts",
+        threads: Optional[int] = None,
+    ) -> List["Video"]:
+        """
+        Renders several shorts from one ffmpeg process.
+
+        The source is read and decoded once, from the first clip start to
+        the last clip end. Each clip is a split/trim (asplit/atrim for the
+        audio) branch with the same crop layout and .ass burn-in as
+        render_short, written to its own output file. Audio is always
+        re-encoded (AAC) since it is cut per clip.
+        """
+        if not clips:
+            return []
+
+        for _, _, subtitle_path, _ in clips:
+            if not Path(subtitle_path).exists():
+                raise FileNotFoundError(f"Subtitle file not found: {subtitle_path}")
+
+        if audio_path is not None:
+            audio_path = Path(audio_path)
+            if not audio_path.exists():
+                raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        source_w, source_h = self.resolution
+        rects = plan_vertical_layout(
+            source_w=source_w,
+            source_h=source_h,
+            streamer_bbox=self.streamer_bbox,
+            target_width=target_width,
+            target_height=target_height,
+            streamer_aspect_ratio=streamer_aspect_ratio,
+        )
+
+        # Only the span covering all clips is read; input-side seeking
+        # resets timestamps to 0 at span_start.
+        span_start = min(start for start, _, _, _ in clips)
+        span_end = max(end for _, end, _, _ in clips)
+        span = ["-ss", str(span_start), "-t", str(span_end - span_start)]
+
+        cmd = ["ffmpeg", "-y", *span, "-i", str(self.path)]
+        if audio_path is not None:
+            cmd += [*span, "-i", str(audio_path)]
+            audio_input = "1:a:0"
+        elif self.media_info.audio is not None:
+            audio_input = "0:a:0"
+        else:
+            audio_input = None
+
+        count = len(clips)
+        parts = [f"[0:v]split={count}" + "".join(f"[src{i}]" for i in range(count))]
+        if audio_input:
+            parts.append(
+                f"[{audio_input}]asplit={count}"
+                + "".join(f"[asrc{i}]" for i in range(count))
+            )
+
+        for i, (start, end, subtitle_path, _) in enumerate(clips):
+            trim = f"start={start - span_start}:end={end - span_start}"
+            parts.append(f"[src{i}]trim={trim},setpts=PTS-STARTPTS[clip{i}]")
+            parts.append(
+                layout_filter(
+                    rects,
+                    input_label=f"clip{i}",
+                    output_label=f"stacked{i}",
+                    label_prefix=f"c{i}_",
+                )
+            )
+            parts.append(
+                f"[stacked{i}]ass='{str(subtitle_path)}':fontsdir='{fonts_dir}'[v{i}]"
+            )
+            if audio_input:
+                parts.append(f"[asrc{i}]atrim={trim},asetpts=PTS-STARTPTS[a{i}]")
+
+        cmd += ["-filter_complex", ";".join(parts)]
+        for i, (_, _, _, output_path) in enumerate(clips):
+            cmd += ["-map", f"[v{i}]"]
+            if audio_input:
+                cmd += ["-map", f"[a{i}]"]
+            cmd += [
+                "-c:v",
+                "libx264",
+                "-crf",
+                str(crf),
+                "-preset",
+                preset,
+                "-pix_fmt",
+                "yuv420p",
+                "-profile:v",
+                "high",
+                "-level",
+                "4.2",
+                "-movflags",
+                "+faststart",
+                "-c:a",
+                "aac",
+                *_thread_args(threads),
+                str(output_path),
+            ]
+
+        subprocess.run(cmd, check=True)
+
+        return [
+            Video(
+                path=output_path,
+                video_type=VideoType.FINAL,
+                aspect_ratio=(target_width, target_height),
+                job=self.job,
+                media_info=self._merged_info(
+                    audio_path,
+                    "aac",
+                    duration=end - start,
+                    width=target_width,
+                    height=target_height,
+                    codec="h264",
+                ),
+            )
+            for start, end, _, output_path in clips
+        ]
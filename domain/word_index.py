@@ -0,0 +1,55 @@
+from pathlib import Path
+from typing import Callable, List
+
+import numpy as np
+
+from utils.transcript_io import COLUMNAR_SUFFIX, ColumnarTranscript, read_transcript
+
+
+class WordIndex:
+    """
+    Word-level transcript loaded once and sorted by start time.
+
+    start/end are kept as float64 columns so time-range lookups are a
+    binary search instead of a scan over every word.
+    """
+
+    def __init__(self, words: List[dict]):
+        words = sorted(words, key=lambda w: w["start"])
+        self.starts = np.fromiter(
+            (w["start"] for w in words), dtype=np.float64, count=len(words)
+        )
+        self.ends = np.fromiter(
+            (w["end"] for w in words), dtype=np.float64, count=len(words)
+        )
+        self._record: Callable[[int], dict] = words.__getitem__
+
+    @classmethod
+    def from_columnar(cls, transcript: ColumnarTranscript) -> "WordIndex":
+        """Indexes the memory-mapped columns; word dicts are built on lookup."""
+        index = cls.__new__(cls)
+        order = np.argsort(transcript.starts, kind="stable")
+        index.starts = np.asarray(transcript.starts[order], dtype=np.float64)
+        index.ends = np.asarray(transcript.ends[order], dtype=np.float64)
+        index._record = lambda i: transcript.record(int(order[i]))
+        return index
+
+    @classmethod
+    def load(cls, word_transcript_path: Path) -> "WordIndex":
+        """Builds the index from a word transcript (.json, .jsonl or .tcol)."""
+        if word_transcript_path.suffix == COLUMNAR_SUFFIX:
+            return cls.from_columnar(ColumnarTranscript(word_transcript_path))
+        data = read_transcript(word_transcript_path)
+        return cls(data["words"])
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def range(self, start: float, end: float) -> List[dict]:
+        """Words fully inside [start, end], in time order."""
+        lo = int(np.searchsorted(self.starts, start, side="left"))
+        hi = int(np.searchsorted(self.starts, end, side="right"))
+        if lo >= hi:
+            return []
+        inside = np.flatnonzero(self.ends[lo:hi] <= end)
+        return [self._record(lo + int(i)) for i in inside]
@@ -1,3 +1,4 @@
+from pathlib import Path
 from service.run import run_pipeline
 import argparse
 
@@ -6,10 +7,39 @@ def main():
     parser = argparse.ArgumentParser(
         description="Chapterize: Convert YouTube videos to shorts"
     )
-    parser.add_argument("--video", required=True, help="YouTube video URL to process")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--video", help="YouTube video URL to process")
+    source.add_argument(
+        "--batch", type=Path, help="File with one video URL per line (batch mode)"
+    )
+    source.add_argument(
+        "--playlist", help="Playlist/channel URL, every video is processed"
+    )
+    source.add_argument(
+        "--queue",
+        type=Path,
+        help="Queue file to watch; URLs appended to it are processed (daemon mode)",
+    )
+    parser.add_argument(
+        "--results",
+        type=Path,
+        help="JSONL file receiving one result record per finished video",
+    )
     args = parser.parse_args()
 
-    run_pipeline(youtube_url=args.video)
+    if args.video:
+        run_pipeline(youtube_url=args.video)
+        return
+
+    # Long-lived worker: models stay loaded across videos
+    from service.batch import expand_playlist, read_url_file, run_batch, watch_queue
+
+    if args.queue:
+        watch_queue(args.queue, results_path=args.results)
+    elif args.playlist:
+        run_batch(expand_playlist(args.playlist), results_path=args.results)
+    else:
+        run_batch(read_url_file(args.batch), results_path=args.results)
 
 
 if __name__ == "__main__":
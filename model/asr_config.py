@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ASRConfig:
+    """
+    faster-whisper engine settings, selectable per job.
+
+    cpu_threads / num_workers only affect speed; the remaining fields can
+    change the transcript and are part of the artifact cache key.
+    """
+
+    model_size: str = "medium"
+    compute_type: str = "int8"
+    cpu_threads: int = 0  # 0 = CTranslate2 default
+    num_workers: int = 1
+    beam_size: int = 5
+    batched: bool = False  # decode VAD-split chunks in batches
+    batch_size: int = 16
+    streaming: bool = False  # windowed ASR written incrementally as JSONL
+    window_seconds: float = 600.0
+    window_overlap_seconds: float = 10.0
+
+    @property
+    def cache_params(self) -> dict:
+        params = {
+            "asr_model": self.model_size,
+            "compute_type": self.compute_type,
+            "beam_size": self.beam_size,
+            "batched": self.batched,
+        }
+        if self.batched:
+            params["batch_size"] = self.batch_size
+        if self.streaming:
+            params["window_seconds"] = self.window_seconds
+            params["window_overlap_seconds"] = self.window_overlap_seconds
+        return params
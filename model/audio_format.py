@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class AudioFormat(Enum):
+    MP3 = "mp3"  # re-encode best audio to 192 kbps MP3 (legacy)
+    NATIVE = "native"  # keep the source stream (m4a/aac preferred, else opus), no transcode
+    PCM = "pcm"  # 16 kHz mono WAV, ASR-ready
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+# Codecs that can be stream-copied into the final MP4 shorts
+MP4_COPY_CODECS = ("aac",)
+
+
+@dataclass
+class AudioStream:
+    """
+    Downloaded audio file plus the stream metadata later stages need
+    to decide between copying and re-encoding.
+    """
+
+    path: Path
+    codec: Optional[str] = None  # e.g. "aac", "opus", "mp3", "pcm_s16le"
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    bitrate: Optional[float] = None  # kbps
+
+    @property
+    def container(self) -> str:
+        return self.path.suffix.lstrip(".")
+
+    @property
+    def mp4_copyable(self) -> bool:
+        return self.codec in MP4_COPY_CODECS
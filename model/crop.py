@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class CropRect:
+    """
+    A crop region in source pixels and the size it is scaled to.
+    """
+
+    x: int
+    y: int
+    width: int
+    height: int
+    out_width: int
+    out_height: int
@@ -0,0 +1,44 @@
+# Response schemas (google-genai / OpenAPI subset) for structured JSON output
+
+CHAPTERS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "chapters": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "title": {"type": "STRING"},
+                    "start": {"type": "NUMBER"},
+                    "end": {"type": "NUMBER"},
+                    "engagement_score": {"type": "NUMBER"},
+                },
+                "required": ["title", "start", "end", "engagement_score"],
+                "property_ordering": ["title", "start", "end", "engagement_score"],
+            },
+        }
+    },
+    "required": ["chapters"],
+}
+
+STREAMER_DETECTION_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "is_reaction": {"type": "BOOLEAN"},
+        "confidence": {"type": "NUMBER"},
+        "reason": {"type": "STRING"},
+        "streamer_bbox": {
+            "type": "OBJECT",
+            "nullable": True,
+            "properties": {
+                "x": {"type": "NUMBER"},
+                "y": {"type": "NUMBER"},
+                "width": {"type": "NUMBER"},
+                "height": {"type": "NUMBER"},
+            },
+            "required": ["x", "y", "width", "height"],
+        },
+    },
+    "required": ["is_reaction", "confidence", "reason", "streamer_bbox"],
+    "property_ordering": ["is_reaction", "confidence", "reason", "streamer_bbox"],
+}
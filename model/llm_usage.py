@@ -0,0 +1,36 @@
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+
+@dataclass
+class LLMUsage:
+    label: str
+    model: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency: float = 0.0  # seconds
+    cached: bool = False  # served from the response cache, no tokens spent
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    @classmethod
+    def total(cls, usages: Iterable["LLMUsage"], label: Optional[str] = None) -> "LLMUsage":
+        usages = list(usages)
+        return cls(
+            label=label or (usages[0].label if usages else ""),
+            model=usages[0].model if usages else "",
+            input_tokens=sum(u.input_tokens for u in usages),
+            output_tokens=sum(u.output_tokens for u in usages),
+            latency=sum(u.latency for u in usages),
+            cached=bool(usages) and all(u.cached for u in usages),
+        )
+
+    def __str__(self) -> str:
+        if self.cached:
+            return f"{self.label} ({self.model}): cached"
+        return (
+            f"{self.label} ({self.model}): {self.input_tokens} in / "
+            f"{self.output_tokens} out tokens, {self.latency:.1f}s"
+        )
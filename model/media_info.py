@@ -0,0 +1,94 @@
+from dataclasses import asdict, dataclass, replace
+from typing import Optional
+
+
+@dataclass
+class VideoStreamInfo:
+    width: int
+    height: int
+    codec: Optional[str] = None  # e.g. "h264", "vp9", "av1"
+    fps: Optional[float] = None
+    pix_fmt: Optional[str] = None
+    bitrate: Optional[float] = None  # kbps
+
+
+@dataclass
+class AudioStreamInfo:
+    codec: Optional[str] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    bitrate: Optional[float] = None  # kbps
+
+
+@dataclass
+class MediaInfo:
+    """
+    Probed container and stream metadata of one media file.
+    keyframe_interval is the typical keyframe spacing in seconds;
+    start_time is the container's first timestamp.
+    """
+
+    duration: float
+    format_name: Optional[str] = None
+    bitrate: Optional[float] = None  # kbps
+    video: Optional[VideoStreamInfo] = None
+    audio: Optional[AudioStreamInfo] = None
+    keyframe_interval: Optional[float] = None
+    start_time: float = 0.0
+
+    @property
+    def resolution(self) -> tuple[int, int]:
+        if self.video is None:
+            raise ValueError("Media has no video stream")
+        return self.video.width, self.video.height
+
+    def derive(
+        self,
+        duration: Optional[float] = None,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        codec: Optional[str] = None,
+        audio: Optional[AudioStreamInfo] = None,
+    ) -> "MediaInfo":
+        """
+        Expected info of a file made from this one. A new size or codec
+        means the video was re-encoded, so its bitrate and keyframe
+        interval become unknown (None). `audio` replaces the audio stream
+        (e.g. one muxed in from another file).
+        """
+        video = self.video
+        reencoded = any(v is not None for v in (width, height, codec))
+        if video is not None and reencoded:
+            video = replace(
+                video,
+                width=width or video.width,
+                height=height or video.height,
+                codec=codec or video.codec,
+                bitrate=None,
+            )
+        return replace(
+            self,
+            duration=self.duration if duration is None else duration,
+            bitrate=None,
+            video=video,
+            audio=audio or self.audio,
+            keyframe_interval=None if reencoded else self.keyframe_interval,
+            start_time=0.0,
+        )
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MediaInfo":
+        video = data.get("video")
+        audio = data.get("audio")
+        return cls(
+            duration=float(data["duration"]),
+            format_name=data.get("format_name"),
+            bitrate=data.get("bitrate"),
+            video=VideoStreamInfo(**video) if video else None,
+            audio=AudioStreamInfo(**audio) if audio else None,
+            keyframe_interval=data.get("keyframe_interval"),
+            start_time=float(data.get("start_time") or 0.0),
+        )
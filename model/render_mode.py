@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class RenderMode(Enum):
+    LEGACY = "legacy"  # merge -> subclip -> crop -> burn-in (multiple encodes)
+    FUSED = "fused"  # single ffmpeg job per short (one decode, one encode)
+    BATCH = "batch"  # one ffmpeg job for all shorts (one decode, one encode per short)
@@ -0,0 +1,22 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from model.short import Short
+
+
+@dataclass
+class RenderReport:
+    """
+    Outcome of a (possibly concurrent) render batch.
+
+    render_times holds each short's own wall time (by subtitle stem),
+    measured while sharing the CPU with the other workers; a BATCH render
+    has none, only the total wall_time.
+    """
+
+    rendered: List[Short] = field(default_factory=list)
+    failures: Dict[str, str] = field(default_factory=dict)
+    workers: int = 1
+    threads_per_job: int = 0
+    wall_time: float = 0.0
+    render_times: Dict[str, float] = field(default_factory=dict)
@@ -16,3 +16,15 @@ class StreamerDetectionResult:
     confidence: float
     reason: str
     bounding_box: Optional[StreamerBBox] = None
+
+
+@dataclass
+class ChannelLayout:
+    """Facecam layout last detected for a channel."""
+
+    channel_id: str
+    is_reaction: bool
+    confidence: float
+    video_id: str
+    bounding_box: Optional[StreamerBBox] = None
+    updated_at: float = 0.0
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class TranscriptFormat(Enum):
+    JSON = "json"  # .json (or .jsonl when streaming)
+    COLUMNAR = "columnar"  # memory-mappable .tcol
@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class VideoSection:
+    """
+    A downloaded time range of the source video.
+    `start` is the file's first timestamp on the source timeline, so a
+    seek to t in the file (ffmpeg -ss is relative to it) is start + t.
+    """
+
+    path: Path
+    start: float
+    end: float
+
+    def contains(self, start: float, end: float) -> bool:
+        return self.start <= start and end <= self.end
@@ -0,0 +1,113 @@
+import json
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import yt_dlp
+
+from domain.job import JobContext
+from service.run import run_pipeline
+from service.transcribe_audio import get_asr_model, get_diarization_cache
+
+
+def expand_playlist(playlist_url: str) -> List[str]:
+    """Resolves a playlist/channel URL into its video URLs (no download)."""
+    ydl_opts = {"extract_flat": "in_playlist", "quiet": True, "no_warnings": True}
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(playlist_url, download=False)
+
+    entries = info.get("entries") or [info]
+    return [e.get("url") or e.get("webpage_url") for e in entries if e]
+
+
+def read_url_file(path: Path) -> List[str]:
+    """Reads one URL per line, skipping blanks and '#' comments."""
+    urls = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            urls.append(line)
+    return urls
+
+
+def warm_up_models(speaker_diarization: bool = True) -> None:
+    """Loads ASR (and diarization) models once so every job reuses them."""
+    get_asr_model()
+    if speaker_diarization:
+        get_diarization_cache().warmup()
+
+
+def _emit(result: dict, results_path: Optional[Path]) -> None:
+    """Streams one result record as soon as its video finishes."""
+    line = json.dumps(result, ensure_ascii=False)
+    print(f"RESULT {line}", flush=True)
+    if results_path is not None:
+        with open(results_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def process_url(url: str, results_path: Optional[Path] = None) -> dict:
+    """Runs one pipeline job with resident models; never raises."""
+    job = JobContext()
+    started = time.perf_counter()
+    result = {"url": url, "job_id": job.job_id}
+    try:
+        outputs = run_pipeline(youtube_url=url, job=job, keep_models=True)
+        result.update(status="ok", outputs=[str(p) for p in outputs])
+    except Exception as e:
+        print(f"Warning: Job {job.job_id} failed for {url}: {e}")
+        result.update(status="error", error=str(e))
+    result["elapsed"] = round(time.perf_counter() - started, 2)
+
+    _emit(result, results_path)
+    return result
+
+
+def run_batch(urls: Iterable[str], results_path: Optional[Path] = None) -> List[dict]:
+    """
+    Processes many URLs in one long-lived process.
+
+    Models are loaded once up front and stay resident across jobs; a failing
+    video is reported and the batch continues.
+    """
+    warm_up_models()
+    return [process_url(url, results_path) for url in urls]
+
+
+def watch_queue(
+    queue_path: Path,
+    results_path: Optional[Path] = None,
+    poll_interval: float = 5.0,
+) -> None:
+    """
+    Daemon mode: processes URLs appended to a queue file, forever.
+
+    Progress is kept as a byte offset in '<queue>.offset', so a restarted
+    worker resumes after the last URL it finished.
+    """
+    offset_path = queue_path.with_name(queue_path.name + ".offset")
+    offset = int(offset_path.read_text()) if offset_path.exists() else 0
+
+    warm_up_models()
+    print(f"-> Watching queue {queue_path} (offset {offset})...")
+
+    while True:
+        if not queue_path.exists():
+            time.sleep(poll_interval)
+            continue
+
+        with open(queue_path, "rb") as f:
+            f.seek(offset)
+            line = f.readline()
+
+        # Only consume complete lines; a partial write is picked up next poll
+        if not line.endswith(b"\n"):
+            time.sleep(poll_interval)
+            continue
+
+        url = line.decode("utf-8").strip()
+        if url and not url.startswith("#"):
+            process_url(url, results_path)
+
+        offset += len(line)
+        offset_path.write_text(str(offset))
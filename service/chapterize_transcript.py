@@ -1,30 +1,46 @@
+import asyncio
+from dataclasses import asdict
 from pathlib import Path
 import json
-from google import genai
-from google.genai import types
+from typing import List, Optional, Tuple
 
-from core.config import GEMINI_API_KEY, GEMINI_MODEL
+from core.config import (
+    GEMINI_MODEL,
+    CHAPTER_WINDOW_SECONDS,
+    CHAPTER_WINDOW_OVERLAP_SECONDS,
+    CHAPTER_CONCURRENCY,
+)
 from core.gemini import resolve_model
+from domain.artifact_store import get_artifact_store, hash_bytes, hash_file
+from domain.job import JobContext
+from domain.llm_gateway import LLMGateway, get_llm_gateway
 from domain.paths import Paths
 from model.chapter import Chapter
-from utils.llm_helper import extract_json, load_system_prompt
+from model.llm_schema import CHAPTERS_SCHEMA
+from model.llm_usage import LLMUsage
+from utils.llm_helper import load_system_prompt
+from utils.transcript_io import read_transcript
+from utils.transcript_prompt import ENCODING_VERSION, encode_transcript
+
+# (owned_start, owned_end, segments): a window owns chapters starting in
+# [owned_start, owned_end); its segments extend `overlap` seconds past
+# owned_end, so it sees the whole of a chapter crossing that seam
+TranscriptWindow = Tuple[float, float, List[dict]]
 
 
 def load_transcript(path: Path) -> dict:
-    if not path.exists():
-        raise FileNotFoundError(path)
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return read_transcript(path)
 
 
 def write_chapters(
     transcript_path: Path,
     chapters_payload: dict,
+    job: Optional[JobContext] = None,
 ) -> Path:
     """
     Writes chapter JSON to data/chapters using transcript base name.
     """
-    chapter_dir = Paths.get_chapter_dir()
+    chapter_dir = (job or Paths).get_chapter_dir()
     chapter_file_name = f"{transcript_path.stem.split(".")[0]}.json"
     output_path = chapter_dir / chapter_file_name
     with open(output_path, "w", encoding="utf-8") as f:
@@ -33,38 +49,87 @@ def write_chapters(
     return output_path
 
 
-def chapterize_transcript(
-    transcript_path: Path,
-) -> Path:
-    """
-    Runs Gemini chapterization and writes chapters JSON to disk.
+def split_windows(
+    segments: List[dict], window: float, overlap: float
+) -> List[TranscriptWindow]:
+    """Cuts sentence segments into windows of `window` seconds plus `overlap`."""
+    if not segments:
+        return []
 
-    Returns:
-        Path: written chapter file path
+    last_end = max(s["end"] for s in segments)
+    windows = []
+    owned_start = 0.0
+    while owned_start < last_end:
+        owned_end = owned_start + window
+        window_segments = [
+            s for s in segments if owned_start <= s["start"] < owned_end + overlap
+        ]
+        if window_segments:
+            windows.append((owned_start, owned_end, window_segments))
+        owned_start = owned_end
+
+    # The last window owns everything up to the end of the transcript
+    if windows:
+        owned_start, _, window_segments = windows[-1]
+        windows[-1] = (owned_start, float("inf"), window_segments)
+    return windows
+
+
+def merge_window_chapters(
+    results: List[Tuple[float, float, List[Chapter]]],
+    duplicate_ratio: float = 0.5,
+) -> List[Chapter]:
     """
-    if not GEMINI_API_KEY:
-        raise RuntimeError("GEMINI_API_KEY is not set")
+    Stitches per-window chapters into one list.
 
-    client = genai.Client(api_key=GEMINI_API_KEY)
-    model = resolve_model(GEMINI_MODEL)
+    A chapter is kept only by the window owning its start: overlap only
+    extends a window forward, so that window saw the chapter from its
+    start. Leftover overlaps at the seams are resolved by merging the two
+    chapters (union span, higher engagement score) when they cover mostly
+    the same span, otherwise by trimming the later one to start where the
+    earlier one ends.
+    """
+    owned = [
+        ch
+        for owned_start, owned_end, chapters in results
+        for ch in chapters
+        if owned_start <= ch.start < owned_end
+    ]
+    owned.sort(key=lambda ch: ch.start)
 
-    system_prompt = load_system_prompt(Path("prompt/chapterize_system.md"))
-    transcript = load_transcript(transcript_path)
+    merged: List[Chapter] = []
+    for ch in owned:
+        if not merged or ch.start >= merged[-1].end:
+            merged.append(ch)
+            continue
 
-    response = client.models.generate_content(
-        model=model.value,
-        contents=[
-            system_prompt,
-            json.dumps(transcript, ensure_ascii=False),
-        ],
-        config=types.GenerateContentConfig(
-            temperature=0.4,
-        ),
-    )
+        prev = merged[-1]
+        shared = min(prev.end, ch.end) - ch.start
+        shorter = min(prev.end - prev.start, ch.end - ch.start)
+        if shorter <= 0 or shared / shorter >= duplicate_ratio:
+            # Two views of one chapter: each window may have seen only one
+            # end of it, so keep the union and the better-rated title
+            best = ch if ch.engagement_score > prev.engagement_score else prev
+            merged[-1] = Chapter(
+                title=best.title,
+                start=prev.start,
+                end=max(prev.end, ch.end),
+                engagement_score=best.engagement_score,
+            )
+        elif ch.end > prev.end:
+            merged.append(
+                Chapter(
+                    title=ch.title,
+                    start=prev.end,
+                    end=ch.end,
+                    engagement_score=ch.engagement_score,
+                )
+            )
+    return merged
 
-    data = extract_json(response.text)
 
-    chapters = [
+def _parse_chapters(data: dict) -> List[Chapter]:
+    return [
         Chapter(
             title=c["title"],
             start=float(c["start"]),
@@ -74,6 +139,151 @@ def chapterize_transcript(
         for c in data["chapters"]
     ]
 
+
+def _request_kwargs(
+    model: str,
+    system_prompt: str,
+    segments: List[dict],
+    language: Optional[str],
+    use_cache: bool,
+) -> dict:
+    return dict(
+        model=model,
+        system_prompt=system_prompt,
+        contents=[encode_transcript(segments, language=language)],
+        temperature=0.4,
+        schema=CHAPTERS_SCHEMA,
+        label="chapterize",
+        use_cache=use_cache,
+        parse=_parse_chapters,
+    )
+
+
+async def _request_windows(
+    gateway: LLMGateway,
+    model: str,
+    system_prompt: str,
+    language: Optional[str],
+    windows: List[TranscriptWindow],
+    concurrency: int,
+    use_cache: bool,
+) -> list:
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def request(window: TranscriptWindow):
+        _, _, segments = window
+        async with semaphore:
+            return await gateway.agenerate_json(
+                **_request_kwargs(model, system_prompt, segments, language, use_cache)
+            )
+
+    return await asyncio.gather(*(request(w) for w in windows), return_exceptions=True)
+
+
+def _chapterize_windowed(
+    gateway: LLMGateway,
+    model: str,
+    system_prompt: str,
+    language: Optional[str],
+    windows: List[TranscriptWindow],
+    concurrency: int,
+    use_cache: bool = True,
+) -> Tuple[List[Chapter], List[LLMUsage], bool]:
+    """
+    Requests every window concurrently and merges the results.
+
+    Returns:
+        (chapters, usages, complete): complete is False if some window failed.
+    """
+    print(
+        f"-> Chapterizing {len(windows)} windows "
+        f"({max(1, concurrency)} concurrent requests)..."
+    )
+    outcomes = asyncio.run(
+        _request_windows(
+            gateway, model, system_prompt, language, windows, concurrency, use_cache
+        )
+    )
+
+    results = []
+    usages = []
+    for (owned_start, owned_end, _), outcome in zip(windows, outcomes):
+        if isinstance(outcome, BaseException):
+            print(f"Warning: Chapter window starting at {owned_start:.0f}s failed: {outcome}")
+            continue
+        chapters, usage = outcome
+        results.append((owned_start, owned_end, chapters))
+        usages.append(usage)
+
+    if not results:
+        raise RuntimeError("Chapterization failed for every transcript window.")
+
+    return merge_window_chapters(results), usages, len(results) == len(windows)
+
+
+def chapterize_transcript(
+    transcript_path: Path,
+    job: Optional[JobContext] = None,
+    window_seconds: float = CHAPTER_WINDOW_SECONDS,
+    window_overlap_seconds: float = CHAPTER_WINDOW_OVERLAP_SECONDS,
+    concurrency: int = CHAPTER_CONCURRENCY,
+    use_cache: bool = True,
+) -> Path:
+    """
+    Runs Gemini chapterization and writes chapters JSON to disk.
+
+    Transcripts longer than window_seconds are split into overlapping
+    windows chapterized in parallel (see merge_window_chapters); a failing
+    window only loses its own chapters. use_cache=False skips both the
+    chapters cache and the Gemini response cache.
+
+    Returns:
+        Path: written chapter file path
+    """
+    model = resolve_model(GEMINI_MODEL)
+    system_prompt = load_system_prompt(Path("prompt/chapterize_system.md"))
+
+    store = get_artifact_store()
+    video_id = transcript_path.stem.split(".")[0]
+    cache_params = {
+        "model": model.value,
+        "prompt": hash_bytes(system_prompt.encode("utf-8")),
+        "transcript": hash_file(transcript_path),
+        "temperature": 0.4,
+        "encoding": ENCODING_VERSION,
+        "window": [window_seconds, window_overlap_seconds],
+        # Window merge rule (see merge_window_chapters)
+        "merge": "start-owner",
+    }
+    if use_cache:
+        cached = store.fetch(
+            "chapters", video_id, cache_params, (job or Paths).get_chapter_dir()
+        )
+        if cached:
+            return cached[0]
+
+    gateway = get_llm_gateway()
+    transcript = load_transcript(transcript_path)
+    segments = transcript.get("segments") or []
+    language = transcript.get("language")
+
+    windows = []
+    if window_seconds > 0:
+        windows = split_windows(segments, window_seconds, window_overlap_seconds)
+
+    complete = True
+    if len(windows) > 1:
+        chapters, usages, complete = _chapterize_windowed(
+            gateway, model.value, system_prompt, language, windows, concurrency, use_cache
+        )
+    else:
+        chapters, usage = gateway.generate_json(
+            **_request_kwargs(model.value, system_prompt, segments, language, use_cache)
+        )
+        usages = [usage]
+    usage = LLMUsage.total(usages, label="chapterize")
+    print(f"-> Chapterization total: {usage}")
+
     payload = {
         "chapters": [
             {
@@ -83,12 +293,19 @@ def chapterize_transcript(
                 "engagement_score": ch.engagement_score,
             }
             for ch in chapters
-        ]
+        ],
+        # Per-video LLM cost (ignored by load_chapters)
+        "usage": asdict(usage),
     }
 
     output_path = write_chapters(
         transcript_path=transcript_path,
         chapters_payload=payload,
+        job=job,
     )
 
+    # Partial results are used for this run but retried next time
+    if complete:
+        store.store("chapters", video_id, cache_params, [output_path])
+
     return output_path
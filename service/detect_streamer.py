@@ -1,57 +1,39 @@
+from dataclasses import asdict
+from io import BytesIO
 from pathlib import Path
-from typing import List
-from PIL import Image
-from google import genai
+from typing import List, Optional, Union
+import json
+
+import numpy as np
 from google.genai import types
+from PIL import Image
 
-from core.config import GEMINI_API_KEY, GEMINI_MODEL
+from core.config import GEMINI_MODEL, FRAME_JPEG_QUALITY
 from core.gemini import resolve_model
+from domain.artifact_store import get_artifact_store, hash_bytes
+from domain.job import JobContext
+from domain.llm_gateway import get_llm_gateway
+from domain.paths import Paths
+from model.llm_schema import STREAMER_DETECTION_SCHEMA
 from model.streamer import StreamerBBox, StreamerDetectionResult
-from utils.llm_helper import load_system_prompt, extract_json
-
-
-def detect_streamer(frame_paths: List[Path]) -> StreamerDetectionResult:
-    """
-    Analyzes a list of video frames to detect if it's a reaction video
-    and locates the streamer's bounding box.
-    """
-    if not GEMINI_API_KEY:
-        raise RuntimeError("GEMINI_API_KEY is not set")
-
-    if not frame_paths:
-        raise ValueError("No frames provided for detection.")
+from utils.llm_helper import load_system_prompt
 
-    client = genai.Client(api_key=GEMINI_API_KEY)
-    model = resolve_model(GEMINI_MODEL)
-    system_prompt = load_system_prompt(Path("prompt/streamer_detection_system.md"))
-
-    images = []
-    for p in frame_paths:
-        if not p.exists():
-            continue
-        try:
-            img = Image.open(p)
-            images.append(img)
-        except Exception as e:
-            print(f"Warning: Could not load frame {p}: {e}")
+SYSTEM_PROMPT_PATH = Path("prompt/streamer_detection_system.md")
 
-    if not images:
-        raise RuntimeError("No valid images could be loaded from the provided paths.")
+# A frame on disk, an (H, W, 3) RGB array or a PIL image
+Frame = Union[Path, np.ndarray, Image.Image]
 
-    contents = [system_prompt]
-    contents.extend(images)
 
-    response = client.models.generate_content(
-        model=model.value,
-        contents=contents,
-        config=types.GenerateContentConfig(
-            temperature=0.2,
-            response_mime_type="application/json",
-        ),
-    )
+def _cache_params() -> dict:
+    system_prompt = load_system_prompt(SYSTEM_PROMPT_PATH)
+    return {
+        "model": resolve_model(GEMINI_MODEL).value,
+        "prompt": hash_bytes(system_prompt.encode("utf-8")),
+        "temperature": 0.2,
+    }
 
-    data = extract_json(response.text)
 
+def _parse_detection(data: dict) -> StreamerDetectionResult:
     bbox_data = data.get("streamer_bbox")
     bbox = None
 
@@ -69,3 +51,98 @@ def detect_streamer(frame_paths: List[Path]) -> StreamerDetectionResult:
         reason=data["reason"],
         bounding_box=bbox,
     )
+
+
+def _load_frame(frame: Frame) -> Optional[Image.Image]:
+    if isinstance(frame, np.ndarray):
+        return Image.fromarray(frame)
+    if isinstance(frame, Image.Image):
+        return frame
+    if not frame.exists():
+        return None
+    try:
+        return Image.open(frame)
+    except Exception as e:
+        print(f"Warning: Could not load frame {frame}: {e}")
+        return None
+
+
+def encode_frame(image: Image.Image, quality: int = FRAME_JPEG_QUALITY) -> types.Part:
+    """JPEG-compresses a frame for upload."""
+    buffer = BytesIO()
+    image.convert("RGB").save(buffer, format="JPEG", quality=quality)
+    return types.Part.from_bytes(data=buffer.getvalue(), mime_type="image/jpeg")
+
+
+def store_detection(
+    result: StreamerDetectionResult,
+    video_id: str,
+    job: Optional[JobContext] = None,
+) -> Path:
+    """Writes '<video_id>.detection.json' and saves it to the artifact store."""
+    data = asdict(result)
+    data["streamer_bbox"] = data.pop("bounding_box")
+
+    detection_path = (job or Paths).get_frame_dir() / f"{video_id}.detection.json"
+    with open(detection_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    get_artifact_store().store("streamer", video_id, _cache_params(), [detection_path])
+    return detection_path
+
+
+def load_cached_detection(
+    video_id: str, job: Optional[JobContext] = None
+) -> Optional[StreamerDetectionResult]:
+    """Returns a previously stored detection for this video, if any."""
+    cached = get_artifact_store().fetch(
+        "streamer", video_id, _cache_params(), (job or Paths).get_frame_dir()
+    )
+    if not cached:
+        return None
+    with open(cached[0], "r", encoding="utf-8") as f:
+        return _parse_detection(json.load(f))
+
+
+def detect_streamer(
+    frames: List[Frame],
+    video_id: Optional[str] = None,
+    job: Optional[JobContext] = None,
+    use_cache: bool = True,
+) -> StreamerDetectionResult:
+    """
+    Analyzes a list of video frames to detect if it's a reaction video
+    and locates the streamer's bounding box.
+
+    Frames may be in-memory RGB arrays (see utils.extract_frames.sample_frames),
+    PIL images or image files; they are JPEG-compressed only for the upload.
+
+    If video_id is given, the result is saved to the artifact store
+    (see load_cached_detection). use_cache=False skips the Gemini
+    response cache.
+    """
+    if not frames:
+        raise ValueError("No frames provided for detection.")
+
+    model = resolve_model(GEMINI_MODEL)
+    system_prompt = load_system_prompt(SYSTEM_PROMPT_PATH)
+
+    images = [img for img in (_load_frame(f) for f in frames) if img is not None]
+
+    if not images:
+        raise RuntimeError("No valid images could be loaded from the provided frames.")
+
+    result, _ = get_llm_gateway().generate_json(
+        model=model.value,
+        system_prompt=system_prompt,
+        contents=[encode_frame(img) for img in images],
+        temperature=0.2,
+        schema=STREAMER_DETECTION_SCHEMA,
+        label="detect_streamer",
+        use_cache=use_cache,
+        parse=_parse_detection,
+    )
+
+    if video_id:
+        store_detection(result, video_id, job=job)
+
+    return result
@@ -0,0 +1,225 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from model.streamer import StreamerBBox, StreamerDetectionResult
+
+# Frame size the local detector works at (normalized output is size-independent)
+ANALYSIS_WIDTH = 320
+ANALYSIS_HEIGHT = 180
+
+EDGE_THRESHOLD = 0.06  # gray-level step (0-1) counted as an edge
+PERSISTENCE = 0.7  # fraction of frames an edge must be present in
+MIN_SIDE = 0.08  # facecam side bounds, relative to the frame
+MAX_SIDE = 0.6
+MIN_ASPECT, MAX_ASPECT = 0.5, 3.0
+MIN_SIDE_COVERAGE = 0.6  # every inner side must be backed by real edges
+# A window flush with the frame border shows fewer real sides, so it
+# proves less: confidence = mean inner coverage x weight[inner sides]
+INNER_SIDE_WEIGHT = {2: 0.85, 3: 0.95, 4: 1.0}
+MIN_MOTION = 0.01  # mean temporal std inside a live camera feed
+MAX_CANDIDATES = 16
+
+
+def _longest_runs(mask: np.ndarray) -> np.ndarray:
+    """Longest run of True per row of a 2D mask."""
+    best = np.zeros(mask.shape[0], dtype=np.int32)
+    run = np.zeros(mask.shape[0], dtype=np.int32)
+    for col in mask.T:
+        run = np.where(col, run + 1, 0)
+        best = np.maximum(best, run)
+    return best
+
+
+def _candidate_lines(mask: np.ndarray, min_run: int) -> List[int]:
+    """Indices of the strongest persistent lines, one per ±2 px cluster."""
+    runs = _longest_runs(mask)
+    order = np.argsort(-runs, kind="stable")
+    picked: List[int] = []
+    for i in order:
+        if runs[i] < min_run or len(picked) >= MAX_CANDIDATES:
+            break
+        if all(abs(int(i) - p) > 2 for p in picked):
+            picked.append(int(i))
+    return picked
+
+
+def _coverage(cum: np.ndarray, line: int, lo: int, hi: int) -> Optional[float]:
+    """
+    Fraction of [lo, hi) covered by persistent edge along one line, or
+    None for a side lying on the frame border (nothing to see there).
+    """
+    if line < 0 or line >= cum.shape[0]:
+        return None
+    return float(cum[line, hi] - cum[line, lo]) / max(hi - lo, 1)
+
+
+def _side_score(coverages: List[Optional[float]]) -> float:
+    """
+    Calibrated score of a rectangle from its four side coverages: only
+    inner sides count, each has to pass MIN_SIDE_COVERAGE on its own.
+    """
+    inner = [c for c in coverages if c is not None]
+    if len(inner) not in INNER_SIDE_WEIGHT or min(inner) < MIN_SIDE_COVERAGE:
+        return 0.0
+    return sum(inner) / len(inner) * INNER_SIDE_WEIGHT[len(inner)]
+
+
+def _edge_masks(f: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Edges present in at least PERSISTENCE of the (N, H, W) 0-1 frames."""
+    h_edges = np.abs(np.diff(f, axis=1)) > EDGE_THRESHOLD  # (N, H-1, W)
+    v_edges = np.abs(np.diff(f, axis=2)) > EDGE_THRESHOLD  # (N, H, W-1)
+    return h_edges.mean(axis=0) >= PERSISTENCE, v_edges.mean(axis=0) >= PERSISTENCE
+
+
+def _line_sums(
+    h_mask: np.ndarray, v_mask: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Prefix sums along each line: rows for horizontal, columns for vertical."""
+    # Tolerate 1 px jitter from scaling/compression
+    h_dil = h_mask.copy()
+    h_dil[1:] |= h_mask[:-1]
+    h_dil[:-1] |= h_mask[1:]
+    v_dil = v_mask.copy()
+    v_dil[:, 1:] |= v_mask[:, :-1]
+    v_dil[:, :-1] |= v_mask[:, 1:]
+
+    h_cum = np.pad(np.cumsum(h_dil, axis=1), ((0, 0), (1, 0)))
+    v_cum = np.pad(np.cumsum(v_dil, axis=0), ((1, 0), (0, 0))).T
+    return h_cum, v_cum
+
+
+def _find_rectangle(
+    h_mask: np.ndarray, v_mask: np.ndarray
+) -> Optional[Tuple[float, Tuple[int, int, int, int]]]:
+    """
+    Best (score, (left, top, right, bottom)) rectangle whose sides follow
+    persistent edges. Edge rows/cols index the boundary after that pixel.
+    """
+    height, width = v_mask.shape[0], h_mask.shape[1]
+    min_w, max_w = int(width * MIN_SIDE), int(width * MAX_SIDE)
+    min_h, max_h = int(height * MIN_SIDE), int(height * MAX_SIDE)
+
+    h_cum, v_cum = _line_sums(h_mask, v_mask)
+
+    rows = _candidate_lines(h_mask, min_w) + [-1, height - 1]
+    cols = _candidate_lines(v_mask.T, min_h) + [-1, width - 1]
+
+    best = None
+    for top in rows:
+        for bottom in rows:
+            h = bottom - top
+            if not min_h <= h <= max_h:
+                continue
+            for left in cols:
+                for right in cols:
+                    w = right - left
+                    if not min_w <= w <= max_w or not MIN_ASPECT <= w / h <= MAX_ASPECT:
+                        continue
+                    x0, x1 = left + 1, right + 1
+                    y0, y1 = top + 1, bottom + 1
+                    score = _side_score(
+                        [
+                            _coverage(h_cum, top, x0, x1),
+                            _coverage(h_cum, bottom, x0, x1),
+                            _coverage(v_cum, left, y0, y1),
+                            _coverage(v_cum, right, y0, y1),
+                        ]
+                    )
+                    if score <= 0:
+                        continue
+                    key = (round(score, 2), w * h)
+                    if best is None or key > best[0]:
+                        best = (key, score, (x0, y0, x1, y1))
+
+    if best is None:
+        return None
+    return best[1], best[2]
+
+
+def detect_streamer_local(frames: np.ndarray) -> StreamerDetectionResult:
+    """
+    Finds a persistent facecam window without an LLM.
+
+    Args:
+        frames: (N, H, W) uint8 grayscale frames sampled across the video,
+            ideally ANALYSIS_WIDTH x ANALYSIS_HEIGHT.
+
+    The window's borders are edges present at the same place in nearly
+    every frame (edge persistence); its inside must move over time
+    (motion variance), which rules out static overlays such as logos.
+    Low confidence means "ask Gemini", not "no facecam".
+    """
+    if frames.ndim != 3 or frames.shape[0] < 3:
+        return StreamerDetectionResult(
+            is_reaction=False, confidence=0.0, reason="local: not enough frames"
+        )
+
+    f = frames.astype(np.float32) / 255.0
+    height, width = f.shape[1:]
+
+    # Edge maps per frame, then the fraction of frames each edge shows up in
+    h_mask, v_mask = _edge_masks(f)
+
+    found = _find_rectangle(h_mask, v_mask)
+    if found is None:
+        return StreamerDetectionResult(
+            is_reaction=False, confidence=0.0, reason="local: no persistent window"
+        )
+
+    score, (x0, y0, x1, y1) = found
+    inner = f[:, y0 + 2 : y1 - 2, x0 + 2 : x1 - 2]
+    motion = float(inner.std(axis=0).mean()) if inner.size else 0.0
+    confidence = score if motion >= MIN_MOTION else score * 0.3
+
+    return StreamerDetectionResult(
+        is_reaction=True,
+        confidence=round(confidence, 3),
+        reason=(
+            f"local: persistent window (side score {score:.2f}, "
+            f"motion {motion:.3f})"
+        ),
+        bounding_box=StreamerBBox(
+            x=x0 / width,
+            y=y0 / height,
+            width=(x1 - x0) / width,
+            height=(y1 - y0) / height,
+        ),
+    )
+
+
+def layout_coverage(frames: np.ndarray, bbox: Optional[StreamerBBox]) -> float:
+    """
+    How well a known layout matches a few (N, H, W) uint8 grayscale frames.
+
+    With a bbox: mean edge coverage along its sides inside the frame.
+    Without one (no facecam): 1 minus the score of the best window-like
+    rectangle.
+    Needs no motion analysis, so one or two frames are enough.
+    """
+    if frames.ndim != 3 or frames.shape[0] == 0:
+        return 0.0
+
+    f = frames.astype(np.float32) / 255.0
+    height, width = f.shape[1:]
+    h_mask, v_mask = _edge_masks(f)
+
+    if bbox is None:
+        found = _find_rectangle(h_mask, v_mask)
+        return 1.0 if found is None else 1.0 - found[0]
+
+    x0, x1 = round(bbox.x * width), round((bbox.x + bbox.width) * width)
+    y0, y1 = round(bbox.y * height), round((bbox.y + bbox.height) * height)
+    if x1 - x0 < 2 or y1 - y0 < 2:
+        return 0.0
+
+    h_cum, v_cum = _line_sums(h_mask, v_mask)
+    # Side lines index the boundary after a pixel (see _find_rectangle)
+    coverages = [
+        _coverage(h_cum, y0 - 1, x0, x1),
+        _coverage(h_cum, min(y1 - 1, height - 1), x0, x1),
+        _coverage(v_cum, x0 - 1, y0, y1),
+        _coverage(v_cum, min(x1 - 1, width - 1), y0, y1),
+    ]
+    inner = [c for c in coverages if c is not None]
+    return sum(inner) / len(inner) if inner else 0.0
@@ -0,0 +1,104 @@
+import gc
+import os
+import resource
+import time
+from typing import Optional
+
+import numpy as np
+import torch
+
+from utils.audio_buffer import SAMPLE_RATE
+
+
+def _process_memory_mb(device: str) -> float:
+    """Current memory held by the process (VRAM on cuda, RSS on cpu) in MB."""
+    if device == "cuda":
+        return torch.cuda.memory_allocated() / (1024 * 1024)
+    try:
+        with open("/proc/self/statm", "r") as f:
+            rss_pages = int(f.read().split()[1])
+        return rss_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # Peak RSS (KB on Linux) is the best available fallback
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class DiarizationPipelineCache:
+    """
+    Managed cache for the whisperx/pyannote diarization pipeline.
+
+    Construction and weight loading happen once in load(); repeated jobs
+    reuse the resident pipeline until unload() or until memory exceeds
+    memory_ceiling_mb (0 = no ceiling) after a call.
+    """
+
+    def __init__(
+        self,
+        device: str,
+        auth_token: Optional[str],
+        memory_ceiling_mb: float = 0,
+    ):
+        self.device = device
+        self.auth_token = auth_token
+        self.memory_ceiling_mb = memory_ceiling_mb
+        self._pipeline = None
+        self._warm = False
+
+    @property
+    def loaded(self) -> bool:
+        return self._pipeline is not None
+
+    def load(self):
+        """Builds the pipeline (downloads/loads weights) if not resident."""
+        if self._pipeline is None:
+            if not self.auth_token:
+                raise ValueError("HF_TOKEN is missing in .env for Diarization")
+
+            # Late import to save resources if not needed
+            import whisperx.diarize
+
+            print(f"-> Loading Diarization Pipeline ({self.device})...")
+            started = time.perf_counter()
+            self._pipeline = whisperx.diarize.DiarizationPipeline(
+                use_auth_token=self.auth_token, device=self.device
+            )
+            self._warm = False
+            print(f"-> Diarization Pipeline loaded in {time.perf_counter() - started:.1f}s")
+        return self._pipeline
+
+    def warmup(self, seconds: float = 2.0) -> None:
+        """Runs one pass over silence so lazy init/kernels are paid up front."""
+        pipeline = self.load()
+        if self._warm:
+            return
+        silence = np.zeros(int(SAMPLE_RATE * seconds), dtype=np.float32)
+        try:
+            pipeline(silence)
+        except Exception as e:
+            print(f"Warning: Diarization warmup failed: {e}")
+        self._warm = True
+
+    def unload(self) -> None:
+        """Drops the pipeline to free (V)RAM."""
+        if self._pipeline is None:
+            return
+        self._pipeline = None
+        self._warm = False
+        gc.collect()
+        if self.device == "cuda":
+            torch.cuda.empty_cache()
+        print("-> Diarization Pipeline unloaded.")
+
+    def enforce_ceiling(self) -> bool:
+        """Unloads the pipeline if memory is above the ceiling. Returns True if evicted."""
+        if not self.loaded or self.memory_ceiling_mb <= 0:
+            return False
+        used = _process_memory_mb(self.device)
+        if used <= self.memory_ceiling_mb:
+            return False
+        print(
+            f"-> Memory {used:.0f}MB above ceiling {self.memory_ceiling_mb:.0f}MB, "
+            "evicting diarization pipeline."
+        )
+        self.unload()
+        return True
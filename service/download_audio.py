@@ -1,38 +1,146 @@
+from dataclasses import asdict
+import json
 from pathlib import Path
-import yt_dlp
+from typing import Optional
+from core.config import AUDIO_FORMAT
+from domain.artifact_store import get_artifact_store
+from domain.job import JobContext
 from domain.paths import Paths
+from model.audio_format import AudioFormat
+from model.audio_stream import AudioStream
+from utils.audio_buffer import SAMPLE_RATE
+from utils.video_id import resolve_video_id
+from utils.ytdl import base_options, extract
 
+STREAM_META_SUFFIX = ".stream.json"
 
-def download_audio(
-    youtube_url: str,
-    quiet: bool = False,
-) -> Path:
-    """
-    Downloads audio from a YouTube video as MP3.
-    """
-    audio_dir = Paths.get_audio_dir()
 
+def _normalize_codec(acodec: Optional[str]) -> Optional[str]:
+    """Maps yt-dlp codec strings (e.g. 'mp4a.40.2') to ffmpeg codec names."""
+    if not acodec or acodec == "none":
+        return None
+    if acodec.startswith("mp4a"):
+        return "aac"
+    return acodec.split(".")[0]
+
+
+def _ydl_options(audio_format: AudioFormat, audio_dir: Path, quiet: bool) -> dict:
     ydl_opts = {
+        **base_options(quiet),
         "format": "bestaudio/best",
         "outtmpl": str(audio_dir / "%(id)s.%(ext)s"),
-        "postprocessors": [
+    }
+
+    if audio_format == AudioFormat.MP3:
+        ydl_opts["postprocessors"] = [
             {
                 "key": "FFmpegExtractAudio",
                 "preferredcodec": "mp3",
                 "preferredquality": "192",
             }
-        ],
-        "quiet": quiet,
-        "no_warnings": True,
-    }
+        ]
+    elif audio_format == AudioFormat.PCM:
+        ydl_opts["postprocessors"] = [
+            {"key": "FFmpegExtractAudio", "preferredcodec": "wav"}
+        ]
+        ydl_opts["postprocessor_args"] = {
+            "extractaudio": ["-ar", str(SAMPLE_RATE), "-ac", "1"]
+        }
+    else:
+        # AAC in m4a can be stream-copied into the MP4 shorts later on
+        ydl_opts["format"] = "bestaudio[ext=m4a]/bestaudio/best"
+
+    return ydl_opts
+
+
+def _stream_from_info(
+    info: dict, audio_format: AudioFormat, audio_dir: Path
+) -> AudioStream:
+    video_id = info["id"]
+
+    if audio_format == AudioFormat.MP3:
+        return AudioStream(
+            path=audio_dir / f"{video_id}.mp3",
+            codec="mp3",
+            sample_rate=info.get("asr"),
+            channels=info.get("audio_channels"),
+            bitrate=192,
+        )
+
+    if audio_format == AudioFormat.PCM:
+        return AudioStream(
+            path=audio_dir / f"{video_id}.wav",
+            codec="pcm_s16le",
+            sample_rate=SAMPLE_RATE,
+            channels=1,
+            bitrate=SAMPLE_RATE * 16 / 1000,
+        )
+
+    downloads = info.get("requested_downloads") or [{}]
+    filepath = downloads[0].get("filepath")
+    path = Path(filepath) if filepath else audio_dir / f"{video_id}.{info['ext']}"
+    return AudioStream(
+        path=path,
+        codec=_normalize_codec(info.get("acodec")),
+        sample_rate=info.get("asr"),
+        channels=info.get("audio_channels"),
+        bitrate=info.get("abr"),
+    )
+
+
+def _write_stream_meta(stream: AudioStream) -> Path:
+    meta_path = stream.path.with_name(stream.path.stem + STREAM_META_SUFFIX)
+    meta = asdict(stream)
+    meta["path"] = stream.path.name
+    meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return meta_path
+
+
+def _read_stream_meta(meta_path: Path) -> AudioStream:
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    meta["path"] = meta_path.parent / meta["path"]
+    return AudioStream(**meta)
+
+
+def download_audio(
+    youtube_url: str,
+    quiet: bool = False,
+    job: Optional[JobContext] = None,
+    audio_format: Optional[AudioFormat] = None,
+    info_path: Optional[Path] = None,
+) -> AudioStream:
+    """
+    Downloads audio from a YouTube video.
+
+    Args:
+        audio_format: MP3 (192 kbps re-encode), NATIVE (source stream as-is)
+            or PCM (16 kHz mono WAV). Defaults to AUDIO_FORMAT.
+        info_path: Metadata from resolve_info, reused instead of re-extracting.
+
+    Returns:
+        AudioStream: file path plus codec/sample rate/channels/bitrate.
+    """
+    audio_format = audio_format or AudioFormat(AUDIO_FORMAT.lower())
+    audio_dir = (job or Paths).get_audio_dir()
+
+    store = get_artifact_store()
+    cache_id = resolve_video_id(youtube_url)
+    cache_params = {"format": audio_format.value}
+    cached = store.fetch("audio", cache_id, cache_params, audio_dir)
+    if cached:
+        meta_path = next(p for p in cached if p.name.endswith(STREAM_META_SUFFIX))
+        return _read_stream_meta(meta_path)
+
+    ydl_opts = _ydl_options(audio_format, audio_dir, quiet)
+
+    info = extract(youtube_url, ydl_opts, info_path=info_path)
 
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(youtube_url, download=True)
-        video_id = info["id"]
+    stream = _stream_from_info(info, audio_format, audio_dir)
 
-    mp3_path = audio_dir / f"{video_id}.mp3"
+    if not stream.path.exists():
+        raise RuntimeError(f"Audio download failed ({audio_format.value})")
 
-    if not mp3_path.exists():
-        raise RuntimeError("MP3 download failed")
+    meta_path = _write_stream_meta(stream)
+    store.store("audio", cache_id, cache_params, [stream.path, meta_path])
 
-    return mp3_path
+    return stream
@@ -1,39 +1,222 @@
+import json
+import threading
 from pathlib import Path
-import yt_dlp
+from typing import List, Optional, Tuple
+from yt_dlp.utils import download_range_func
+from core.config import VIDEO_MAX_HEIGHT, VIDEO_PIXEL_DENSITY
+from domain.artifact_store import get_artifact_store
+from domain.job import JobContext
+from domain.media_probe import probe_media
 from domain.paths import Paths
+from model.streamer import StreamerBBox
 from model.video_quality import VideoQuality
+from model.video_section import VideoSection
+from utils.crop_layout import required_source_height
+from utils.video_id import resolve_video_id
+from utils.ytdl import base_options, cancel_hook, extract
+
+SECTIONS_META_SUFFIX = ".sections.json"
+
+
+def _video_formats(info: dict) -> List[dict]:
+    return [
+        f
+        for f in info.get("formats") or []
+        if f.get("height") and f.get("vcodec") != "none"
+    ]
+
+
+def select_video_quality(
+    info: dict,
+    streamer_bbox: Optional[StreamerBBox] = None,
+    pixel_density: float = VIDEO_PIXEL_DENSITY,
+    max_height: int = VIDEO_MAX_HEIGHT,
+    target_width: int = 1080,
+    target_height: int = 1920,
+) -> VideoQuality:
+    """
+    Picks the lowest VideoQuality whose source still covers the planned
+    crop rectangles at pixel_density (see required_source_height).
+
+    A tight streamer crop asks for more source pixels, a plain center crop
+    for fewer; the result is capped by max_height and by the highest
+    format the video actually offers.
+    """
+    formats = _video_formats(info)
+    if formats:
+        best = max(formats, key=lambda f: f["height"])
+        source_w, source_h = best.get("width"), best["height"]
+    else:
+        source_w, source_h = info.get("width"), info.get("height")
+    source_aspect = source_w / source_h if source_w and source_h else 16 / 9
+
+    needed = required_source_height(
+        source_aspect,
+        streamer_bbox=streamer_bbox,
+        pixel_density=pixel_density,
+        target_width=target_width,
+        target_height=target_height,
+    )
+    available = source_h or max_height
+    wanted = min(needed, available)
+
+    qualities = sorted(VideoQuality, key=lambda q: q.max_height)
+    allowed = [q for q in qualities if q.max_height <= max_height] or qualities[:1]
+    quality = next((q for q in allowed if q.max_height >= wanted), allowed[-1])
+    print(
+        f"-> Source quality {quality.name}: layout needs {needed}p "
+        f"at density {pixel_density} (best available {available}p)"
+    )
+    return quality
 
 
 def download_video(
     youtube_url: str,
     quality: VideoQuality = VideoQuality.P1080,
     quiet: bool = False,
+    job: Optional[JobContext] = None,
+    info_path: Optional[Path] = None,
+    cancel: Optional[threading.Event] = None,
 ) -> Path:
     """
     Downloads a YouTube video with selectable max resolution.
 
     - Default: best video up to 1080p
     - Accepts higher fps variants (1080p50, 1080p60, etc.)
+    - info_path: metadata from resolve_info, reused instead of re-extracting
+    - cancel: aborts the download (DownloadCancelled) once set
     """
-    video_dir = Paths.get_video_dir()
+    video_dir = (job or Paths).get_video_dir()
+
+    store = get_artifact_store()
+    cache_id = resolve_video_id(youtube_url)
+    cache_params = {"quality": quality.name}
+    cached = store.fetch("video", cache_id, cache_params, video_dir)
+    if cached:
+        return cached[0]
 
     format_selector = f"bestvideo[height<={quality.max_height}]/best"
 
     ydl_opts = {
+        **base_options(quiet),
         "format": format_selector,
         "outtmpl": str(video_dir / "%(id)s.%(ext)s"),
         "merge_output_format": "mp4",
-        "quiet": quiet,
-        "no_warnings": True,
     }
+    if cancel is not None:
+        ydl_opts["progress_hooks"] = [cancel_hook(cancel)]
 
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(youtube_url, download=True)
-        video_id = info["id"]
+    info = extract(youtube_url, ydl_opts, info_path=info_path)
 
-    output_path = next(video_dir.glob(f"{video_id}.*"), None)
+    downloads = info.get("requested_downloads") or [{}]
+    filepath = downloads[0].get("filepath")
+    output_path = Path(filepath) if filepath else None
 
     if not output_path or not output_path.exists():
         raise RuntimeError("Video download failed")
 
+    store.store("video", cache_id, cache_params, [output_path])
+
     return output_path
+
+
+def merge_ranges(
+    ranges: List[Tuple[float, float]], padding: float = 0.0
+) -> List[Tuple[float, float]]:
+    """Pads ranges and merges the ones that overlap after padding."""
+    merged: List[Tuple[float, float]] = []
+    for start, end in sorted(ranges):
+        start, end = max(0.0, start - padding), end + padding
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _write_sections_meta(video_dir: Path, video_id: str, sections: List[VideoSection]) -> Path:
+    meta_path = video_dir / f"{video_id}{SECTIONS_META_SUFFIX}"
+    meta = [{"file": s.path.name, "start": s.start, "end": s.end} for s in sections]
+    meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    return meta_path
+
+
+def _read_sections_meta(meta_path: Path) -> List[VideoSection]:
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    return [
+        VideoSection(path=meta_path.parent / m["file"], start=m["start"], end=m["end"])
+        for m in meta
+    ]
+
+
+def download_video_sections(
+    youtube_url: str,
+    ranges: List[Tuple[float, float]],
+    quality: VideoQuality = VideoQuality.P1080,
+    padding: float = 2.0,
+    quiet: bool = False,
+    job: Optional[JobContext] = None,
+    info_path: Optional[Path] = None,
+) -> List[VideoSection]:
+    """
+    Downloads only the given time ranges (plus padding) of a YouTube video,
+    one file per merged range, using yt-dlp's download_ranges.
+
+    Sections are stream-copied, so each file starts at the keyframe before
+    its requested start. The files keep the source timestamps (-copyts) and
+    VideoSection.start is the probed first timestamp, not the requested one.
+
+    Returns:
+        List[VideoSection]: downloaded files with their source time ranges.
+    """
+    if not ranges:
+        raise ValueError("No ranges to download.")
+
+    video_dir = (job or Paths).get_video_dir()
+    merged = merge_ranges(ranges, padding=padding)
+
+    store = get_artifact_store()
+    cache_id = resolve_video_id(youtube_url)
+    cache_params = {"quality": quality.name, "ranges": merged, "timeline": "copyts"}
+    cached = store.fetch("video_sections", cache_id, cache_params, video_dir)
+    if cached:
+        meta_path = next(p for p in cached if p.name.endswith(SECTIONS_META_SUFFIX))
+        return _read_sections_meta(meta_path)
+
+    ydl_opts = {
+        **base_options(quiet),
+        "format": f"bestvideo[height<={quality.max_height}]/best",
+        "outtmpl": str(video_dir / "%(id)s.%(section_start)d-%(section_end)d.%(ext)s"),
+        "merge_output_format": "mp4",
+        "download_ranges": download_range_func(None, merged),
+        # Stream copy starts at the keyframe before the cut; keeping the
+        # source timestamps lets the probe tell where exactly that is.
+        "external_downloader_args": {"ffmpeg_o": ["-copyts"]},
+    }
+
+    info = extract(youtube_url, ydl_opts, info_path=info_path)
+
+    info_dir = (job or Paths).get_info_dir()
+    sections = []
+    for download in info.get("requested_downloads") or []:
+        path = Path(download["filepath"])
+        if not path.exists():
+            raise RuntimeError(f"Video section download failed: {path.name}")
+        sections.append(
+            VideoSection(
+                path=path,
+                start=probe_media(path, sidecar_dir=info_dir).start_time,
+                end=float(download.get("section_end") or 0.0),
+            )
+        )
+
+    if not sections:
+        raise RuntimeError("Video section download failed")
+
+    sections.sort(key=lambda s: s.start)
+    meta_path = _write_sections_meta(video_dir, info["id"], sections)
+    store.store(
+        "video_sections", cache_id, cache_params, [s.path for s in sections] + [meta_path]
+    )
+
+    return sections
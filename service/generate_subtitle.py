@@ -1,6 +1,7 @@
 from pathlib import Path
-import json
+from typing import Optional
 
+from domain.word_index import WordIndex
 from model.subtitle_style import ASSStyle
 from utils.ass_format import seconds_to_ass_time, bool_to_ass
 from utils.speaker_color import get_speaker_color_map
@@ -15,17 +16,18 @@ def generate_subtitle(
     fade_in_ms: int = 50,
     fade_out_ms: int = 50,
     is_upper_case: bool = True,
+    word_index: Optional[WordIndex] = None,
 ):
     """
     Generates an .ass subtitle file for a specific time range using speaker-aware coloring.
-    """
-    if not word_transcript_path.exists():
-        raise FileNotFoundError(word_transcript_path)
 
-    with open(word_transcript_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    Pass a shared word_index when generating several ranges of the same
+    transcript, so it is loaded only once.
+    """
+    if word_index is None:
+        word_index = WordIndex.load(word_transcript_path)
 
-    clip_words = [w for w in data["words"] if w["start"] >= start and w["end"] <= end]
+    clip_words = word_index.range(start, end)
 
     if not clip_words:
         print(f"Warning: No words found for subtitle range {start}-{end}")
@@ -0,0 +1,276 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Optional
+
+from domain.paths import Paths
+from domain.video import Video
+from model.render_mode import RenderMode
+from model.render_report import RenderReport
+from model.short import Short
+from model.video_section import VideoSection
+
+# Below this many threads a single x264 encode of 1080x1920 loses more
+# to lookahead/slice starvation than the extra parallel job gains.
+MIN_THREADS_PER_JOB = 4
+
+
+def plan_worker_pool(
+    job_count: int, workers: int = 0, cpu_budget: int = 0
+) -> tuple[int, int]:
+    """
+    Splits a core budget into (concurrent ffmpeg jobs, -threads per job).
+
+    Args:
+        job_count: Number of shorts to render.
+        workers: Requested concurrency (0 = derive from the budget).
+        cpu_budget: Cores available for rendering (0 = all cores).
+    """
+    budget = cpu_budget if cpu_budget > 0 else (os.cpu_count() or 1)
+    if workers <= 0:
+        workers = max(1, budget // MIN_THREADS_PER_JOB)
+    workers = max(1, min(workers, job_count, budget))
+    threads = max(1, budget // workers)
+    return workers, threads
+
+
+def _render_legacy(video: Video, short: Short, threads: Optional[int]) -> Path:
+    """Multi-step render: subclip -> vertical crop -> subtitle burn-in."""
+    paths = video.job or Paths
+    subclip_path = paths.get_video_dir() / f"{short.subtitle_path.stem}_horizontal.mp4"
+    chapter = short.chapter
+    subclip = video.extract_subclip(
+        start_time=chapter.start,
+        end_time=chapter.end,
+        output_path=subclip_path,
+    )
+    cropped_subclip = subclip.smart_vertical_crop(
+        output_path=paths.get_video_dir() / f"{short.subtitle_path.stem}.mp4",
+        threads=threads,
+    )
+    final = cropped_subclip.burn_in_subtitle(
+        subtitle_path=short.subtitle_path,
+        output_path=paths.get_short_output_dir() / f"{short.subtitle_path.stem}.mp4",
+        threads=threads,
+    )
+    return final.path
+
+
+def _source_for(
+    video: Video, short: Short, sections: Optional[List[VideoSection]]
+) -> tuple[Video, float]:
+    """Picks the downloaded section covering the chapter (or the full video)."""
+    if not sections:
+        return video, 0.0
+    chapter = short.chapter
+    section = next((s for s in sections if s.contains(chapter.start, chapter.end)), None)
+    if section is None:
+        raise RuntimeError(
+            f"No downloaded section covers {chapter.start:.1f}-{chapter.end:.1f}s"
+        )
+    source = Video(
+        path=section.path,
+        video_type=video.video_type,
+        streamer_bbox=video.streamer_bbox,
+        streamer_detected=video.streamer_detected,
+        job=video.job,
+    )
+    return source, section.start
+
+
+def _render_fused(
+    video: Video,
+    short: Short,
+    audio_path: Path,
+    threads: Optional[int],
+    audio_codec: str,
+    sections: Optional[List[VideoSection]] = None,
+) -> Path:
+    """Single ffmpeg job straight from the original video and audio."""
+    paths = video.job or Paths
+    chapter = short.chapter
+    video, source_offset = _source_for(video, short, sections)
+    final = video.render_short(
+        start_time=chapter.start,
+        end_time=chapter.end,
+        subtitle_path=short.subtitle_path,
+        output_path=paths.get_short_output_dir() / f"{short.subtitle_path.stem}.mp4",
+        audio_path=audio_path,
+        threads=threads,
+        audio_codec=audio_codec,
+        source_offset=source_offset,
+    )
+    return final.path
+
+
+def _render_batch(
+    video: Video,
+    shorts: List[Short],
+    audio_path: Path,
+    threads: Optional[int],
+    report: RenderReport,
+) -> None:
+    """
+    All shorts from one ffmpeg job. Shorts without a subtitle file are
+    recorded as failures up front; an ffmpeg failure fails the rest.
+    """
+    output_dir = (video.job or Paths).get_short_output_dir()
+    missing = [s for s in shorts if not s.subtitle_path.exists()]
+    for short in missing:
+        print(f"Warning: No subtitles for {short.subtitle_path.stem}, skipping it.")
+        report.failures[short.subtitle_path.stem] = (
+            f"Subtitle file not found: {short.subtitle_path}"
+        )
+    shorts = [s for s in shorts if s not in missing]
+    if not shorts:
+        return
+
+    clips = [
+        (
+            short.chapter.start,
+            short.chapter.end,
+            short.subtitle_path,
+            output_dir / f"{short.subtitle_path.stem}.mp4",
+        )
+        for short in shorts
+    ]
+
+    try:
+        finals = video.render_shorts_batch(clips, audio_path=audio_path, threads=threads)
+    except Exception as e:
+        print(f"Warning: Batch render failed: {e}")
+        for short in shorts:
+            report.failures[short.subtitle_path.stem] = str(e)
+        return
+
+    for short, final in zip(shorts, finals):
+        short.final_video_path = final.path
+        report.rendered.append(short)
+
+
+def _render_one(
+    video: Video,
+    short: Short,
+    audio_path: Path,
+    mode: RenderMode,
+    threads: Optional[int],
+    audio_codec: str,
+    sections: Optional[List[VideoSection]],
+) -> float:
+    """Renders one short and returns its wall time in seconds."""
+    started = time.perf_counter()
+    if mode == RenderMode.LEGACY:
+        short.final_video_path = _render_legacy(video, short, threads)
+    else:
+        short.final_video_path = _render_fused(
+            video, short, audio_path, threads, audio_codec, sections
+        )
+    return time.perf_counter() - started
+
+
+def render_shorts(
+    video: Video,
+    shorts: List[Short],
+    audio_path: Path,
+    mode: RenderMode = RenderMode.FUSED,
+    workers: int = 1,
+    cpu_budget: int = 0,
+    copy_audio: bool = False,
+    sections: Optional[List[VideoSection]] = None,
+) -> RenderReport:
+    """
+    Renders every short into the shorts output directory.
+
+    A failing short is recorded in the report instead of aborting the batch.
+
+    Args:
+        video: Source video without audio (its job decides the workspace).
+        shorts: Shorts with generated subtitles.
+        audio_path: External audio track of the source video.
+        mode: LEGACY (merge + 3 steps per short), FUSED (1 job per short) or
+            BATCH (1 job for all shorts; falls back to FUSED with sections).
+        workers: Concurrent renders (1 = sequential, 0 = derive from cpu_budget).
+        cpu_budget: Cores shared by all concurrent renders (0 = all cores).
+        copy_audio: Stream-copy the audio (MP4-compatible source, e.g. AAC).
+        sections: Downloaded chapter ranges; each short renders from the
+            section covering it (FUSED only, `video` is then the first section).
+    """
+    video.detect_streamer_once()
+
+    audio_codec = "copy" if copy_audio else "aac"
+
+    if sections and mode == RenderMode.LEGACY:
+        raise ValueError("LEGACY render mode needs the full video, not sections.")
+    if sections and mode == RenderMode.BATCH:
+        print("BATCH render mode needs the full video, rendering sections one by one.")
+        mode = RenderMode.FUSED
+
+    if mode == RenderMode.LEGACY:
+        video = video.add_audio(
+            audio_path,
+            output_path=(video.job or Paths).get_video_dir()
+            / f"{video.path.stem}.merged.mp4",
+            audio_codec=audio_codec,
+        )
+
+    report = RenderReport()
+    if not shorts:
+        return report
+
+    if mode == RenderMode.BATCH:
+        # One process encodes every short, so it gets the whole core budget.
+        report.workers, report.threads_per_job = 1, cpu_budget
+        started = time.perf_counter()
+        _render_batch(video, shorts, audio_path, cpu_budget or None, report)
+        report.wall_time = time.perf_counter() - started
+        print(
+            f"Rendered {len(report.rendered)}/{len(shorts)} shorts "
+            f"in one batch job in {report.wall_time:.1f}s"
+        )
+        return report
+
+    if workers == 1:
+        # Sequential path keeps ffmpeg's own threading defaults.
+        pool_size, threads = 1, None
+    else:
+        pool_size, threads = plan_worker_pool(len(shorts), workers, cpu_budget)
+    report.workers = pool_size
+    report.threads_per_job = threads or 0
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=pool_size) as pool:
+        futures = {
+            pool.submit(
+                _render_one,
+                video,
+                short,
+                audio_path,
+                mode,
+                threads,
+                audio_codec,
+                sections,
+            ): short
+            for short in shorts
+        }
+        for future in as_completed(futures):
+            short = futures[future]
+            try:
+                report.render_times[short.subtitle_path.stem] = future.result()
+                report.rendered.append(short)
+            except Exception as e:
+                print(f"Warning: Render failed for {short.subtitle_path.stem}: {e}")
+                report.failures[short.subtitle_path.stem] = str(e)
+    report.wall_time = time.perf_counter() - started
+
+    # Keep chapter order regardless of completion order
+    report.rendered.sort(key=shorts.index)
+
+    print(
+        f"Rendered {len(report.rendered)}/{len(shorts)} shorts "
+        f"({report.workers} workers x {report.threads_per_job or 'auto'} threads) "
+        f"in {report.wall_time:.1f}s"
+    )
+    for name, seconds in report.render_times.items():
+        print(f"-> {name}: {seconds:.1f}s")
+    return report
@@ -0,0 +1,35 @@
+from pathlib import Path
+from typing import Optional
+import json
+import yt_dlp
+from domain.job import JobContext
+from domain.paths import Paths
+from utils.ytdl import base_options
+
+
+def resolve_info(
+    youtube_url: str,
+    quiet: bool = True,
+    job: Optional[JobContext] = None,
+) -> Path:
+    """
+    Extracts the video metadata once and caches it as '<id>.info.json'.
+
+    download_audio / download_video reuse this file, so one job costs a
+    single metadata round-trip instead of one per stream.
+
+    Returns:
+        Path: written info-json path
+    """
+    info_dir = (job or Paths).get_info_dir()
+
+    with yt_dlp.YoutubeDL(base_options(quiet)) as ydl:
+        # Unprocessed: each download applies its own format selection later
+        info = ydl.extract_info(youtube_url, download=False, process=False)
+        info = ydl.sanitize_info(info)
+
+    info_path = info_dir / f"{info['id']}.info.json"
+    with open(info_path, "w", encoding="utf-8") as f:
+        json.dump(info, f, ensure_ascii=False)
+
+    return info_path
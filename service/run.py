@@ -1,56 +1,213 @@
-from domain.paths import Paths
+import threading
+from pathlib import Path
+from typing import List, Optional
+from yt_dlp.utils import DownloadCancelled
+from core.config import (
+    RENDER_MODE,
+    RENDER_WORKERS,
+    RENDER_CPU_BUDGET,
+    VIDEO_RANGE_DOWNLOAD,
+    VIDEO_RANGE_PADDING_SECONDS,
+    VIDEO_AUTO_QUALITY,
+    CHANNEL_LAYOUT_CACHE,
+)
+from domain.artifact_store import get_artifact_store
 from domain.audio import Audio
+from domain.channel_layout import channel_key, get_channel_layouts
+from domain.job import JobContext
 from domain.video import Video, VideoType
 from service.download_audio import download_audio
-from service.download_video import download_video
-from utils.cleanup import cleanup_data_dir, move_shorts_to_final
+from service.detect_streamer import load_cached_detection
+from service.download_video import (
+    download_video,
+    download_video_sections,
+    select_video_quality,
+)
+from service.render_shorts import render_shorts
+from service.resolve_info import resolve_info
+from service.transcribe_audio import DEFAULT_ASR_CONFIG
+from model.asr_config import ASRConfig
+from model.chapter import Chapter
+from model.render_mode import RenderMode
+from model.video_quality import VideoQuality
+from model.video_section import VideoSection
+from utils.background import BackgroundStages
+from utils.cleanup import cleanup_stale_jobs, move_shorts_to_final
+from utils.ytdl import load_info
 
 
-def run_pipeline(youtube_url: str) -> None:
+def _channel_id(info_path: Optional[Path]) -> Optional[str]:
+    if not CHANNEL_LAYOUT_CACHE or info_path is None:
+        return None
+    return channel_key(load_info(info_path))
+
+
+def _source_quality(info_path: Optional[Path], job: JobContext) -> VideoQuality:
+    """Source resolution for the planned crop layout (1080p if unknown)."""
+    if not VIDEO_AUTO_QUALITY or info_path is None:
+        return VideoQuality.P1080
+
+    info = load_info(info_path)
+    # A detection from an earlier run (or the channel's usual layout) tells
+    # whether the split layout applies
+    detection = load_cached_detection(info["id"], job=job)
+    streamer_bbox = detection.bounding_box if detection else None
+    channel_id = _channel_id(info_path)
+    if detection is None and channel_id:
+        layout = get_channel_layouts().get(channel_id)
+        streamer_bbox = layout.bounding_box if layout else None
+    return select_video_quality(info, streamer_bbox=streamer_bbox)
+
+
+def _prepare_video(
+    youtube_url: str,
+    job: JobContext,
+    info_path: Optional[Path] = None,
+    chapters: Optional[List[Chapter]] = None,
+    cancel: Optional[threading.Event] = None,
+) -> tuple[Video, Optional[List[VideoSection]]]:
+    """
+    Downloads the source video and detects the streamer layout (I/O-bound).
+    With chapters, only their time ranges (plus padding) are downloaded.
+    Setting `cancel` aborts the full download and skips the detection.
+    """
+    quality = _source_quality(info_path, job)
+
+    sections = None
+    if chapters:
+        sections = download_video_sections(
+            youtube_url,
+            ranges=[(ch.start, ch.end) for ch in chapters],
+            quality=quality,
+            padding=VIDEO_RANGE_PADDING_SECONDS,
+            quiet=True,
+            job=job,
+            info_path=info_path,
+        )
+        video_file_path = sections[0].path
+    else:
+        video_file_path = download_video(
+            youtube_url,
+            quality=quality,
+            quiet=True,
+            job=job,
+            info_path=info_path,
+            cancel=cancel,
+        )
+    if cancel is not None and cancel.is_set():
+        raise DownloadCancelled("Video stage cancelled")
+
+    video = Video(
+        path=video_file_path,
+        video_type=VideoType.WITHOUT_AUDIO,
+        job=job,
+    )
+    video.detect_streamer_once(channel_id=_channel_id(info_path))
+    return video, sections
+
+
+def run_pipeline(
+    youtube_url: str,
+    render_mode: Optional[RenderMode] = None,
+    render_workers: int = RENDER_WORKERS,
+    job: Optional[JobContext] = None,
+    keep_models: bool = False,
+    asr_config: Optional[ASRConfig] = None,
+    range_download: bool = VIDEO_RANGE_DOWNLOAD,
+) -> List[Path]:
     """
     Full pipeline to create shorts from a YouTube video.
+
+    Each run works in its own JobContext workspace, so several pipelines
+    can run on one host at the same time.
+
+    Args:
+        keep_models: Keep ASR/diarization models resident (batch worker).
+        asr_config: faster-whisper engine settings (defaults from env).
+        range_download: Download only the chapter ranges once chapters are
+            known (instead of the full video in parallel with ASR). Saves
+            bandwidth but serializes the download after chapterization.
+
+    Returns:
+        List[Path]: final output files (videos and title texts).
     """
-    cleanup_data_dir()
+    render_mode = render_mode or RenderMode(RENDER_MODE.lower())
+    job = job or JobContext()
+    if range_download and render_mode in (RenderMode.LEGACY, RenderMode.BATCH):
+        print(
+            f"{render_mode.name} render mode needs the full video, "
+            "disabling range download."
+        )
+        range_download = False
+
+    cleanup_stale_jobs()
+    get_artifact_store().evict()
 
-    lock_file = Paths.get_lock_file()
-    if lock_file.exists():
-        raise RuntimeError("Pipeline is already running. Lock file exists.")
-    lock_file.touch()
+    job.acquire()
+    print(f"-> Job {job.job_id} ({job.root})")
 
+    succeeded = False
     try:
-        audio_file_path = download_audio(youtube_url)
-        audio = Audio(audio_file_path)
-        shorts = Audio.run_all(audio)
-
-        video_file_path = download_video(youtube_url)
-        video = Video(
-            path=video_file_path,
-            video_type=VideoType.WITHOUT_AUDIO,
-        )
-        video = video.add_audio(
-            audio_file_path,
-            output_path=Paths.get_video_dir() / f"{video_file_path.stem}.merged.mp4",
-        )
+        # One metadata round-trip, shared by the audio and video downloads
+        info_path = resolve_info(youtube_url, job=job)
 
-        for short in shorts:
-            subclip_path = (
-                Paths.get_video_dir() / f"{short.subtitle_path.stem}_horizontal.mp4"
-            )
-            chapter = short.chapter
-            subclip = video.extract_subclip(
-                start_time=chapter.start,
-                end_time=chapter.end,
-                output_path=subclip_path,
-            )
-            cropped_subclip = subclip.smart_vertical_crop(
-                output_path=Paths.get_video_dir() / f"{short.subtitle_path.stem}.mp4"
-            )
-            cropped_subclip.burn_in_subtitle(
-                subtitle_path=short.subtitle_path,
-                output_path=Paths.get_short_output_dir()
-                / f"{short.subtitle_path.stem}.mp4",
+        with BackgroundStages() as stages:
+            if not range_download:
+                # Video download + streamer detection (network-bound) overlap
+                # with ASR and chapterization
+                stages.submit(
+                    "video",
+                    _prepare_video,
+                    youtube_url,
+                    job,
+                    info_path,
+                    cancel=stages.cancel_event("video"),
+                )
+
+            audio_stream = download_audio(youtube_url, job=job, info_path=info_path)
+            audio = Audio(audio_stream.path, job=job)
+            audio.transcribe(
+                keep_models=keep_models,
+                asr_config=asr_config or DEFAULT_ASR_CONFIG,
             )
-        move_shorts_to_final()
+            audio.chapterize()
+
+            if not audio.chapters:
+                print("No chapters above ENGAGEMENT_THRESHOLD, nothing to render.")
+                # Don't wait for the full download and detection on the way out
+                stages.cancel("video")
+                succeeded = True
+                return []
+
+            if range_download:
+                # Only the selected chapters are fetched; the download overlaps
+                # with subtitle generation
+                stages.submit(
+                    "video", _prepare_video, youtube_url, job, info_path, audio.chapters
+                )
+
+            audio.generate_subtitles()
+            shorts = audio.shorts
+
+            # Join point: rendering needs both branches
+            video, sections = stages.join("video")
+
+        report = render_shorts(
+            video=video,
+            shorts=shorts,
+            audio_path=audio_stream.path,
+            mode=render_mode,
+            workers=render_workers,
+            cpu_budget=RENDER_CPU_BUDGET,
+            copy_audio=audio_stream.mp4_copyable,
+            sections=sections,
+        )
+        if shorts and not report.rendered:
+            raise RuntimeError(f"All shorts failed to render: {report.failures}")
+        outputs = move_shorts_to_final(job)
+        succeeded = True
     finally:
-        if lock_file.exists():
-            lock_file.unlink()
+        # Failed workspaces are kept for inspection until the next stale sweep
+        job.release(remove_workspace=succeeded)
+
+    return outputs
@@ -1,16 +1,43 @@
 import torch
 import functools
 import json
-import gc
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
+
+import numpy as np
 
 # Core ASR Library
-from faster_whisper import WhisperModel
+from faster_whisper import BatchedInferencePipeline, WhisperModel
 
+from model.asr_config import ASRConfig
 from model.transcript import TranscriptionMode
+from model.transcript_format import TranscriptFormat
+from domain.artifact_store import get_artifact_store
+from domain.job import JobContext
 from domain.paths import Paths
-from core.config import HF_TOKEN
+from service.diarization import DiarizationPipelineCache
+from utils.audio_buffer import SAMPLE_RATE, load_pcm
+from utils.transcript_io import (
+    COLUMNAR_SUFFIX,
+    JsonlTranscriptWriter,
+    convert_to_columnar,
+    write_columnar,
+)
+from core.config import (
+    HF_TOKEN,
+    DIARIZATION_MEMORY_CEILING_MB,
+    ASR_MODEL,
+    ASR_COMPUTE_TYPE,
+    ASR_CPU_THREADS,
+    ASR_NUM_WORKERS,
+    ASR_BEAM_SIZE,
+    ASR_BATCHED,
+    ASR_BATCH_SIZE,
+    ASR_STREAMING,
+    ASR_WINDOW_SECONDS,
+    ASR_WINDOW_OVERLAP_SECONDS,
+    TRANSCRIPT_FORMAT,
+)
 
 # --- FIX: PyTorch 2.6+ Security Patch (Required for WhisperX/Pyannote) ---
 _original_load = torch.load
@@ -28,57 +55,357 @@ torch.load = _hack_torch_load
 # --- GLOBAL CONFIGURATION ---
 if torch.cuda.is_available():
     DEVICE = "cuda"
-    COMPUTE_TYPE = "int8"
 else:
     DEVICE = "cpu"
-    COMPUTE_TYPE = "int8"
 
-# Global model instance (Singleton pattern)
+DEFAULT_ASR_CONFIG = ASRConfig(
+    model_size=ASR_MODEL,
+    compute_type=ASR_COMPUTE_TYPE,
+    cpu_threads=ASR_CPU_THREADS,
+    num_workers=ASR_NUM_WORKERS,
+    beam_size=ASR_BEAM_SIZE,
+    batched=ASR_BATCHED,
+    batch_size=ASR_BATCH_SIZE,
+    streaming=ASR_STREAMING,
+    window_seconds=ASR_WINDOW_SECONDS,
+    window_overlap_seconds=ASR_WINDOW_OVERLAP_SECONDS,
+)
+
+# Global model instances (Singleton pattern)
 _ASR_MODEL: Optional[WhisperModel] = None
+_ASR_MODEL_KEY: Optional[tuple] = None
+_BATCHED_PIPELINE: Optional[BatchedInferencePipeline] = None
+_DIARIZATION_CACHE: Optional[DiarizationPipelineCache] = None
 
 
-def get_asr_model(model: str = "medium") -> WhisperModel:
-    """Loads the ASR model once and returns the global instance."""
-    global _ASR_MODEL
-    if _ASR_MODEL is None:
-        print(f"-> Loading faster-whisper Model ({DEVICE})...")
-        _ASR_MODEL = WhisperModel(model, device=DEVICE, compute_type=COMPUTE_TYPE)
+def get_asr_model(config: ASRConfig = DEFAULT_ASR_CONFIG) -> WhisperModel:
+    """
+    Loads the ASR model once and returns the global instance.
+    A job asking for different load-time settings replaces the resident model.
+    """
+    global _ASR_MODEL, _ASR_MODEL_KEY, _BATCHED_PIPELINE
+    key = (config.model_size, config.compute_type, config.cpu_threads, config.num_workers)
+    if _ASR_MODEL is None or _ASR_MODEL_KEY != key:
+        print(
+            f"-> Loading faster-whisper Model {config.model_size} "
+            f"({DEVICE}, {config.compute_type})..."
+        )
+        _ASR_MODEL = WhisperModel(
+            config.model_size,
+            device=DEVICE,
+            compute_type=config.compute_type,
+            cpu_threads=config.cpu_threads,
+            num_workers=config.num_workers,
+        )
+        _ASR_MODEL_KEY = key
+        _BATCHED_PIPELINE = None
     return _ASR_MODEL
 
 
+def get_batched_pipeline(config: ASRConfig = DEFAULT_ASR_CONFIG) -> BatchedInferencePipeline:
+    """Wraps the resident ASR model for batched decoding of VAD chunks."""
+    global _BATCHED_PIPELINE
+    model = get_asr_model(config)
+    if _BATCHED_PIPELINE is None:
+        _BATCHED_PIPELINE = BatchedInferencePipeline(model=model)
+    return _BATCHED_PIPELINE
+
+
+def get_diarization_cache() -> DiarizationPipelineCache:
+    """Returns the global diarization pipeline cache (loaded lazily)."""
+    global _DIARIZATION_CACHE
+    if _DIARIZATION_CACHE is None:
+        _DIARIZATION_CACHE = DiarizationPipelineCache(
+            device=DEVICE,
+            auth_token=HF_TOKEN,
+            memory_ceiling_mb=DIARIZATION_MEMORY_CEILING_MB,
+        )
+    return _DIARIZATION_CACHE
+
+
+def _run_asr(
+    audio,
+    asr_config: ASRConfig,
+    word_timestamps: bool,
+    language: Optional[str] = None,
+):
+    """Runs faster-whisper on a path or a 16 kHz float32 array (lazy generator)."""
+    if asr_config.batched:
+        return get_batched_pipeline(asr_config).transcribe(
+            audio,
+            language=language,
+            vad_filter=True,
+            beam_size=asr_config.beam_size,
+            batch_size=asr_config.batch_size,
+            word_timestamps=word_timestamps,
+        )
+    return get_asr_model(asr_config).transcribe(
+        audio,
+        language=language,
+        vad_filter=True,
+        beam_size=asr_config.beam_size,
+        word_timestamps=word_timestamps,
+    )
+
+
+def _normalize_segment(seg, offset: float = 0.0) -> dict:
+    """Converts a faster-whisper segment to the WhisperX layout (times + offset)."""
+    wx_seg = {
+        "start": seg.start + offset,
+        "end": seg.end + offset,
+        "text": seg.text,
+        "words": [],
+    }
+    if seg.words:
+        for w in seg.words:
+            wx_seg["words"].append(
+                {
+                    "start": w.start + offset,
+                    "end": w.end + offset,
+                    "word": w.word,
+                    "score": w.probability,
+                    # Default speaker if diarization is skipped
+                    "speaker": "SPEAKER_00",
+                }
+            )
+    return wx_seg
+
+
+def _sentence_record(seg: dict) -> dict:
+    return {
+        "start": seg["start"],
+        "end": seg["end"],
+        "text": seg["text"].strip(),
+        "speaker": seg.get("speaker", "SPEAKER_00"),
+    }
+
+
+def _word_records(seg: dict) -> Iterator[dict]:
+    seg_speaker = seg.get("speaker", "SPEAKER_00")
+
+    # 'words' key is guaranteed by our normalization step
+    for w in seg.get("words", []):
+        yield {
+            "start": w["start"],
+            "end": w["end"],
+            "text": w["word"].strip(),
+            # Word-level speaker or fallback to segment speaker
+            "speaker": w.get("speaker", seg_speaker),
+        }
+
+
+def _diarize(
+    audio,
+    min_speakers: Optional[int],
+    max_speakers: Optional[int],
+    keep_diarization_model: bool,
+):
+    """Runs the cached diarization pipeline and returns speaker turns."""
+    diarization_cache = get_diarization_cache()
+    diarize_model = diarization_cache.load()
+
+    print("-> Diarizing (Finding Speakers)...")
+    diarize_segments = diarize_model(
+        audio, min_speakers=min_speakers, max_speakers=max_speakers
+    )
+
+    # Cleanup Diarization model to free VRAM
+    del diarize_model
+    if keep_diarization_model:
+        diarization_cache.enforce_ceiling()
+    else:
+        diarization_cache.unload()
+
+    return diarize_segments
+
+
+def _transcribe_streaming(
+    audio_path: Path,
+    pcm: np.ndarray,
+    mode: TranscriptionMode,
+    diarize_segments,
+    transcript_dir: Path,
+    asr_config: ASRConfig,
+) -> list[Path]:
+    """
+    Windowed ASR with overlap stitching; records are appended to JSONL
+    files as each window finishes, so memory does not grow with duration.
+
+    Each window is a zero-copy slice of window_seconds +
+    window_overlap_seconds from the memory-mapped PCM buffer.
+    Segments starting past the window boundary are left to the next window,
+    and segments starting before the last committed end are dropped as
+    duplicates of the previous window's tail.
+    """
+    window = asr_config.window_seconds
+    overlap = asr_config.window_overlap_seconds
+    word_timestamps = mode != TranscriptionMode.SENTENCE
+
+    writers: list[JsonlTranscriptWriter] = []
+    sentence_writer = word_writer = None
+    if mode in (TranscriptionMode.SENTENCE, TranscriptionMode.BOTH):
+        sentence_writer = JsonlTranscriptWriter(
+            transcript_dir / f"{audio_path.stem}.sentence.jsonl", mode="sentence"
+        )
+        writers.append(sentence_writer)
+    if mode in (TranscriptionMode.WORD, TranscriptionMode.BOTH):
+        word_writer = JsonlTranscriptWriter(
+            transcript_dir / f"{audio_path.stem}.word.jsonl", mode="word"
+        )
+        writers.append(word_writer)
+
+    language: Optional[str] = None
+    committed_end = 0.0
+    window_start = 0.0
+
+    try:
+        while True:
+            first = int(window_start * SAMPLE_RATE)
+            samples = pcm[first : first + int((window + overlap) * SAMPLE_RATE)]
+            if samples.size == 0:
+                break
+            is_last = first + samples.size >= pcm.size
+            boundary = window_start + window
+
+            print(f"-> Transcribing window {window_start:.0f}s-{boundary:.0f}s...")
+            segments_gen, info = _run_asr(
+                samples, asr_config, word_timestamps, language=language
+            )
+            if language is None:
+                # Pin the first detected language for all later windows
+                language = info.language
+                for writer in writers:
+                    writer.write_header(language)
+
+            window_segments = []
+            for seg in segments_gen:
+                start = seg.start + window_start
+                if start < committed_end - 0.01:
+                    continue
+                if not is_last and start >= boundary:
+                    break
+                window_segments.append(_normalize_segment(seg, offset=window_start))
+
+            if diarize_segments is not None and window_segments:
+                import whisperx.diarize
+
+                window_segments = whisperx.diarize.assign_word_speakers(
+                    diarize_segments, {"segments": window_segments}
+                )["segments"]
+
+            for seg in window_segments:
+                if sentence_writer:
+                    sentence_writer.write(_sentence_record(seg))
+                if word_writer:
+                    for record in _word_records(seg):
+                        word_writer.write(record)
+            for writer in writers:
+                writer.flush()
+
+            if window_segments:
+                committed_end = max(committed_end, window_segments[-1]["end"])
+            if is_last:
+                break
+            window_start = boundary
+
+        # Silent input: still produce valid (empty) transcripts
+        for writer in writers:
+            writer.write_header(language or "unknown")
+    finally:
+        for writer in writers:
+            writer.close()
+
+    return [writer.path for writer in writers]
+
+
 def transcribe_audio(
     audio_path: Path,
     mode: TranscriptionMode = TranscriptionMode.BOTH,
     speaker_diarization: bool = True,
     min_speakers: Optional[int] = None,
     max_speakers: Optional[int] = None,
+    job: Optional[JobContext] = None,
+    keep_diarization_model: bool = False,
+    asr_config: ASRConfig = DEFAULT_ASR_CONFIG,
+    transcript_format: Optional[TranscriptFormat] = None,
 ) -> list[Path]:
     """
     Transcribes audio using 'faster-whisper'.
     Optionally performs Speaker Diarization using 'whisperx'.
 
+    With asr_config.streaming, audio is transcribed in overlapping windows
+    and written incrementally as '.jsonl' instead of '.json'.
+
     Args:
         audio_path: Path to the input audio file.
         mode: Output mode (SENTENCE, WORD, or BOTH).
         speaker_diarization: If True, uses WhisperX to identify speakers.
+        job: Workspace to write into (defaults to the global Paths).
+        keep_diarization_model: Keep the diarization pipeline resident
+            for the next call (batch worker) instead of freeing it. It is
+            still evicted when memory exceeds DIARIZATION_MEMORY_CEILING_MB.
+        asr_config: faster-whisper engine settings for this job.
+        transcript_format: JSON or COLUMNAR (.tcol). Defaults to TRANSCRIPT_FORMAT.
     """
     if not audio_path.exists():
         raise FileNotFoundError(audio_path)
 
-    transcript_dir = Paths.get_transcript_dir()
+    transcript_format = transcript_format or TranscriptFormat(TRANSCRIPT_FORMAT.lower())
+    columnar = transcript_format == TranscriptFormat.COLUMNAR
+    transcript_dir = (job or Paths).get_transcript_dir()
+
+    store = get_artifact_store()
+    cache_params = {
+        **asr_config.cache_params,
+        "mode": mode.value,
+        "speaker_diarization": speaker_diarization,
+        "min_speakers": min_speakers,
+        "max_speakers": max_speakers,
+        "format": transcript_format.value,
+    }
+    cached = store.fetch("transcript", audio_path.stem, cache_params, transcript_dir)
+    if cached:
+        return cached
+
+    if speaker_diarization and not HF_TOKEN:
+        raise ValueError("HF_TOKEN is missing in .env for Diarization")
+
     written_files: list[Path] = []
-    audio_file = str(audio_path)
+
+    # Decode once to a shared 16 kHz buffer; ASR and diarization both read
+    # the same memory-mapped pages instead of decoding the file twice.
+    print("-> Decoding audio (16 kHz PCM)...")
+    pcm = load_pcm(audio_path)
+
+    if asr_config.streaming:
+        # Speaker turns are tiny; diarize first so every window can be
+        # labelled and written out immediately.
+        diarize_segments = None
+        if speaker_diarization:
+            diarize_segments = _diarize(
+                pcm, min_speakers, max_speakers, keep_diarization_model
+            )
+        written_files = _transcribe_streaming(
+            audio_path=audio_path,
+            pcm=pcm,
+            mode=mode,
+            diarize_segments=diarize_segments,
+            transcript_dir=transcript_dir,
+            asr_config=asr_config,
+        )
+        if columnar:
+            written_files = [convert_to_columnar(path) for path in written_files]
+        store.store("transcript", audio_path.stem, cache_params, written_files)
+        return written_files
 
     # 1. TRANSCRIPTION (ASR)
     # Uses the global cached model for performance
-    model = get_asr_model()
-
-    print("-> Transcribing (Natural Timing)...")
-    segments_gen, info = model.transcribe(
-        audio_file,
-        vad_filter=True,
-        beam_size=5,
-        word_timestamps=(mode != TranscriptionMode.SENTENCE),
+    if asr_config.batched:
+        print(f"-> Transcribing (Batched, batch_size={asr_config.batch_size})...")
+    else:
+        print("-> Transcribing (Natural Timing)...")
+    segments_gen, info = _run_asr(
+        pcm, asr_config, word_timestamps=(mode != TranscriptionMode.SENTENCE)
     )
 
     raw_segments = list(segments_gen)
@@ -86,41 +413,17 @@ def transcribe_audio(
 
     # 2. DATA NORMALIZATION
     # Convert faster-whisper segments to a format WhisperX accepts (and for uniform output)
-    formatted_segments = []
-    for seg in raw_segments:
-        wx_seg = {"start": seg.start, "end": seg.end, "text": seg.text, "words": []}
-        if seg.words:
-            for w in seg.words:
-                wx_seg["words"].append(
-                    {
-                        "start": w.start,
-                        "end": w.end,
-                        "word": w.word,
-                        "score": w.probability,
-                        # Default speaker if diarization is skipped
-                        "speaker": "SPEAKER_00",
-                    }
-                )
-        formatted_segments.append(wx_seg)
+    formatted_segments = [_normalize_segment(seg) for seg in raw_segments]
 
     transcript_result = {"segments": formatted_segments, "language": model_lang}
 
     # 3. SPEAKER DIARIZATION (Optional)
     if speaker_diarization:
-        if not HF_TOKEN:
-            raise ValueError("HF_TOKEN is missing in .env for Diarization")
-
-        print("-> Diarizing (Finding Speakers)...")
-
         # Late import to save resources if not needed
         import whisperx.diarize
 
-        # Perform Diarization
-        diarize_model = whisperx.diarize.DiarizationPipeline(
-            use_auth_token=HF_TOKEN, device=DEVICE
-        )
-        diarize_segments = diarize_model(
-            audio_file, min_speakers=min_speakers, max_speakers=max_speakers
+        diarize_segments = _diarize(
+            pcm, min_speakers, max_speakers, keep_diarization_model
         )
 
         # Merge Speaker IDs with Word Timestamps
@@ -129,69 +432,59 @@ def transcribe_audio(
             diarize_segments, transcript_result
         )
 
-        # Cleanup Diarization model to free VRAM
-        del diarize_model
-        gc.collect()
-        if DEVICE == "cuda":
-            torch.cuda.empty_cache()
-
     # --- WRITE OUTPUTS ---
     final_segments = transcript_result["segments"]
 
     # ---------- SENTENCE ----------
     if mode in (TranscriptionMode.SENTENCE, TranscriptionMode.BOTH):
-        sentence_path = transcript_dir / f"{audio_path.stem}.sentence.json"
-
-        output_segments = []
-        for seg in final_segments:
-            output_segments.append(
-                {
-                    "start": seg["start"],
-                    "end": seg["end"],
-                    "text": seg["text"].strip(),
-                    "speaker": seg.get("speaker", "SPEAKER_00"),
-                }
+        output_segments = [_sentence_record(seg) for seg in final_segments]
+
+        if columnar:
+            sentence_path = write_columnar(
+                transcript_dir / f"{audio_path.stem}.sentence{COLUMNAR_SUFFIX}",
+                model_lang,
+                "sentence",
+                output_segments,
             )
+        else:
+            sentence_path = transcript_dir / f"{audio_path.stem}.sentence.json"
 
-        payload = {
-            "language": model_lang,
-            "mode": "sentence",
-            "segments": output_segments,
-        }
+            payload = {
+                "language": model_lang,
+                "mode": "sentence",
+                "segments": output_segments,
+            }
 
-        with open(sentence_path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
+            with open(sentence_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2)
         written_files.append(sentence_path)
 
     # ---------- WORD ----------
     if mode in (TranscriptionMode.WORD, TranscriptionMode.BOTH):
-        word_path = transcript_dir / f"{audio_path.stem}.word.json"
-
         all_words = []
         for seg in final_segments:
-            seg_speaker = seg.get("speaker", "SPEAKER_00")
-
-            # 'words' key is guaranteed by our normalization step
-            if "words" in seg:
-                for w in seg["words"]:
-                    all_words.append(
-                        {
-                            "start": w["start"],
-                            "end": w["end"],
-                            "text": w["word"].strip(),
-                            # Word-level speaker or fallback to segment speaker
-                            "speaker": w.get("speaker", seg_speaker),
-                        }
-                    )
-
-        payload = {
-            "language": model_lang,
-            "mode": "word",
-            "words": all_words,
-        }
+            all_words.extend(_word_records(seg))
+
+        if columnar:
+            word_path = write_columnar(
+                transcript_dir / f"{audio_path.stem}.word{COLUMNAR_SUFFIX}",
+                model_lang,
+                "word",
+                all_words,
+            )
+        else:
+            word_path = transcript_dir / f"{audio_path.stem}.word.json"
+
+            payload = {
+                "language": model_lang,
+                "mode": "word",
+                "words": all_words,
+            }
 
-        with open(word_path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
+            with open(word_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2)
         written_files.append(word_path)
 
+    store.store("transcript", audio_path.stem, cache_params, written_files)
+
     return written_files
@@ -0,0 +1,33 @@
+from types import SimpleNamespace
+from typing import Any, List
+
+
+class FakeModels:
+    """Stands in for client.models: replays scripted responses or errors."""
+
+    def __init__(self, responses: List[Any]):
+        self.responses = list(responses)
+        self.calls: List[dict] = []
+
+    def generate_content(self, model, contents, config=None):
+        self.calls.append({"model": model, "contents": contents, "config": config})
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        return SimpleNamespace(
+            text=response,
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=10, candidates_token_count=5
+            ),
+        )
+
+
+class FakeClient:
+    """Any object exposing models.generate_content works as a client."""
+
+    def __init__(self, *responses: Any):
+        self.models = FakeModels(responses or ['{"ok": true}'])
+
+    @property
+    def calls(self) -> List[dict]:
+        return self.models.calls
@@ -0,0 +1,65 @@
+import unittest
+
+from model.chapter import Chapter
+from service.chapterize_transcript import merge_window_chapters, split_windows
+
+
+def _segments(end: float, step: float = 10.0) -> list:
+    return [
+        {"start": t, "end": t + step, "text": "x", "speaker": "SPEAKER_00"}
+        for t in range(0, int(end), int(step))
+    ]
+
+
+class ChapterWindowTest(unittest.TestCase):
+    def test_overlap_only_extends_forward(self):
+        windows = split_windows(_segments(4000), window=1800, overlap=120)
+
+        spans = [(owned_start, owned_end) for owned_start, owned_end, _ in windows]
+        self.assertEqual(spans[:2], [(0, 1800), (1800, 3600)])
+        self.assertEqual(windows[-1][1], float("inf"))
+        first_segments = windows[0][2]
+        self.assertEqual(first_segments[0]["start"], 0)
+        self.assertEqual(first_segments[-1]["start"], 1910)
+
+    def test_chapter_crossing_seam_keeps_its_start(self):
+        # Window 1 sees 0-1920 and reports the whole chapter; window 2
+        # starts at 1800 and only sees its tail.
+        first = [Chapter("intro", 0, 1700, 0.5), Chapter("fight", 1700, 2000, 0.8)]
+        second = [Chapter("fight end", 1800, 2000, 0.7), Chapter("outro", 2000, 2500, 0.6)]
+        results = [(0.0, 1800.0, first), (1800.0, float("inf"), second)]
+
+        merged = merge_window_chapters(results)
+
+        self.assertEqual(
+            [(c.title, c.start, c.end) for c in merged],
+            [("intro", 0, 1700), ("fight", 1700, 2000), ("outro", 2000, 2500)],
+        )
+
+    def test_chapter_cut_at_window_end_is_joined(self):
+        # Window 1's segments end at 1920, so it cuts the chapter short;
+        # window 2 sees the real end.
+        results = [
+            (0.0, 1800.0, [Chapter("talk", 1750, 1920, 0.6)]),
+            (1800.0, float("inf"), [Chapter("talk", 1800, 2100, 0.9)]),
+        ]
+
+        merged = merge_window_chapters(results)
+
+        self.assertEqual(len(merged), 1)
+        self.assertEqual((merged[0].start, merged[0].end), (1750, 2100))
+        self.assertEqual(merged[0].engagement_score, 0.9)
+
+    def test_partial_overlap_is_trimmed(self):
+        results = [
+            (0.0, 1800.0, [Chapter("a", 1500, 1850, 0.6)]),
+            (1800.0, float("inf"), [Chapter("b", 1820, 2400, 0.7)]),
+        ]
+
+        merged = merge_window_chapters(results)
+
+        self.assertEqual([(c.start, c.end) for c in merged], [(1500, 1850), (1850, 2400)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from domain.llm_cache import LLMResponseCache, generate_content
+from tests.fake_llm import FakeClient
+
+
+class LLMResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.cache = LLMResponseCache(self.root, max_bytes=1024**2, ttl_seconds=3600)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _generate(self, client, prompt="system", contents=("hello",), config=None, **kwargs):
+        return generate_content(
+            client,
+            model="gemini-test",
+            system_prompt=prompt,
+            contents=list(contents),
+            config=config,
+            cache=self.cache,
+            **kwargs,
+        )
+
+    def test_identical_request_hits(self):
+        client = FakeClient('{"a": 1}')
+        first, usage = self._generate(client)
+        second, cached_usage = self._generate(client)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(client.calls), 1)
+        self.assertFalse(usage.cached)
+        self.assertTrue(cached_usage.cached)
+        self.assertEqual(cached_usage.total_tokens, 0)
+
+    def test_changed_prompt_content_or_config_misses(self):
+        client = FakeClient('{"a": 1}')
+        self._generate(client)
+        self._generate(client, prompt="other system")
+        self._generate(client, contents=("other content",))
+        self._generate(client, config={"temperature": 0.9})
+        self.assertEqual(len(client.calls), 4)
+
+    def test_use_cache_false_bypasses_and_refreshes(self):
+        client = FakeClient('{"v": 1}', '{"v": 2}')
+        self._generate(client)
+        fresh, _ = self._generate(client, use_cache=False)
+        again, usage = self._generate(client)
+
+        self.assertEqual(len(client.calls), 2)
+        self.assertEqual(fresh, '{"v": 2}')
+        # The bypassing call still stored its fresh response
+        self.assertEqual(again, '{"v": 2}')
+        self.assertTrue(usage.cached)
+
+    def test_expired_entry_is_dropped(self):
+        client = FakeClient('{"a": 1}')
+        self._generate(client)
+        self.cache.ttl_seconds = 0.01
+        time.sleep(0.05)
+        _, usage = self._generate(client)
+
+        self.assertEqual(len(client.calls), 2)
+        self.assertFalse(usage.cached)
+
+    def test_empty_response_is_not_cached(self):
+        client = FakeClient("", '{"a": 1}')
+        self._generate(client)
+        self._generate(client)
+        self.assertEqual(len(client.calls), 2)
+
+    def test_evicts_least_recently_used(self):
+        keys = [self.cache.make_key("m", "s", [str(i)]) for i in range(3)]
+        for i, key in enumerate(keys):
+            self.cache.put(key, "x" * 200)
+            path = self.cache._entry_path(key)
+            os.utime(path, (time.time() - 100 + i, time.time() - 100 + i))
+        # Reading the oldest entry makes it the most recently used
+        self.assertIsNotNone(self.cache.get(keys[0]))
+
+        # Room for exactly two of the three entries
+        sizes = [self.cache._entry_path(k).stat().st_size for k in keys]
+        self.cache.max_bytes = sizes[0] + sizes[2]
+        self.cache.evict()
+
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
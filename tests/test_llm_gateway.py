@@ -0,0 +1,89 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from google.genai import errors
+
+from domain.llm_cache import LLMResponseCache
+from domain.llm_gateway import LLMGateway, get_llm_gateway, set_llm_gateway
+from tests.fake_llm import FakeClient
+
+
+def _gateway(client: FakeClient, cache: LLMResponseCache, max_retries: int = 2) -> LLMGateway:
+    return LLMGateway(
+        client=client, cache=cache, max_retries=max_retries, backoff_seconds=0
+    )
+
+
+class LLMGatewayTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = LLMResponseCache(Path(self.tmp.name), max_bytes=1024**2)
+
+    def tearDown(self):
+        set_llm_gateway(None)
+        self.tmp.cleanup()
+
+    def _generate(self, gateway: LLMGateway, **kwargs):
+        return gateway.generate_json(
+            model="gemini-test",
+            system_prompt="system",
+            contents=["hello"],
+            temperature=0.2,
+            **kwargs,
+        )
+
+    def test_set_llm_gateway_installs_stand_in(self):
+        gateway = _gateway(FakeClient(), self.cache)
+        set_llm_gateway(gateway)
+        self.assertIs(get_llm_gateway(), gateway)
+
+    def test_parses_and_caches(self):
+        client = FakeClient('{"chapters": [1, 2]}')
+        gateway = _gateway(client, self.cache)
+        parse = lambda data: data["chapters"]
+
+        first, usage = self._generate(gateway, parse=parse)
+        second, cached_usage = self._generate(gateway, parse=parse)
+
+        self.assertEqual(first, [1, 2])
+        self.assertEqual(second, [1, 2])
+        self.assertEqual(usage.input_tokens, 10)
+        self.assertTrue(cached_usage.cached)
+        self.assertEqual(len(client.calls), 1)
+
+    def test_retries_transient_api_error(self):
+        client = FakeClient(errors.ServerError(503, {}), '{"ok": true}')
+        data, _ = self._generate(_gateway(client, self.cache))
+        self.assertEqual(data, {"ok": True})
+        self.assertEqual(len(client.calls), 2)
+
+    def test_retries_malformed_and_off_schema_output(self):
+        client = FakeClient("not json", '{"wrong": 1}', '{"chapters": []}')
+        data, _ = self._generate(
+            _gateway(client, self.cache), parse=lambda d: d["chapters"]
+        )
+        self.assertEqual(data, [])
+        self.assertEqual(len(client.calls), 3)
+
+    def test_permanent_api_error_is_not_retried(self):
+        client = FakeClient(errors.ClientError(400, {}))
+        with self.assertRaises(errors.ClientError):
+            self._generate(_gateway(client, self.cache))
+        self.assertEqual(len(client.calls), 1)
+
+    def test_programming_error_is_not_retried(self):
+        client = FakeClient(AttributeError("bug"))
+        with self.assertRaises(AttributeError):
+            self._generate(_gateway(client, self.cache))
+        self.assertEqual(len(client.calls), 1)
+
+    def test_gives_up_after_max_retries(self):
+        client = FakeClient(errors.ServerError(500, {}))
+        with self.assertRaises(errors.ServerError):
+            self._generate(_gateway(client, self.cache, max_retries=2))
+        self.assertEqual(len(client.calls), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import subprocess
+from pathlib import Path
+
+import numpy as np
+
+# Sample format shared by faster-whisper and whisperx/pyannote
+SAMPLE_RATE = 16000
+PCM_SUFFIX = ".pcm16k.f32"
+
+
+def get_pcm_path(audio_path: Path) -> Path:
+    """Raw PCM cache path, next to the audio (i.e. in the audio dir)."""
+    return audio_path.with_name(audio_path.stem + PCM_SUFFIX)
+
+
+def decode_pcm(audio_path: Path) -> Path:
+    """
+    Decodes audio once to raw 16 kHz mono float32 on disk.
+    ffmpeg writes straight to the file, so no full-length array is ever
+    allocated in Python.
+    """
+    pcm_path = get_pcm_path(audio_path)
+    if pcm_path.exists():
+        return pcm_path
+
+    tmp_path = pcm_path.with_name(pcm_path.name + ".tmp")
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-v",
+        "error",
+        "-i",
+        str(audio_path),
+        "-f",
+        "f32le",
+        "-ac",
+        "1",
+        "-ar",
+        str(SAMPLE_RATE),
+        str(tmp_path),
+    ]
+    subprocess.run(cmd, check=True)
+    os.replace(tmp_path, pcm_path)
+    return pcm_path
+
+
+def load_pcm(audio_path: Path) -> np.ndarray:
+    """
+    Returns the decoded audio as a memory-mapped float32 array.
+
+    The mapping is copy-on-write: consumers (torch.from_numpy, slicing)
+    share the same pages without copies, and stray writes never reach disk.
+    """
+    pcm_path = decode_pcm(audio_path)
+    if pcm_path.stat().st_size == 0:
+        return np.zeros(0, dtype=np.float32)
+    return np.memmap(pcm_path, dtype=np.float32, mode="c")
@@ -0,0 +1,66 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class BackgroundStages:
+    """
+    Runs I/O-bound pipeline stages (downloads, remote calls) in background
+    threads while the caller continues with CPU-bound work.
+
+    Usage:
+        with BackgroundStages() as stages:
+            stages.submit("video", download_video, url)
+            ...  # transcription runs meanwhile
+            video_path = stages.join("video")  # join point
+
+    Leaving the block waits for still-running stages, so no stage outlives
+    the job that started it. Exceptions surface at join().
+
+    A stage that is no longer needed can be cancel()ed: it is dropped if it
+    has not started, otherwise its cancel_event is set and a stage watching
+    that event stops early instead of running to the end.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="stage"
+        )
+        self._futures: Dict[str, Future] = {}
+        self._cancel_events: Dict[str, threading.Event] = {}
+
+    def submit(self, name: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        if name in self._futures:
+            raise ValueError(f"Stage '{name}' already submitted.")
+        print(f"-> Starting background stage '{name}'...")
+        future = self._executor.submit(fn, *args, **kwargs)
+        self._futures[name] = future
+        return future
+
+    def cancel_event(self, name: str) -> threading.Event:
+        """Event set when the named stage is cancelled (pass it to the stage)."""
+        return self._cancel_events.setdefault(name, threading.Event())
+
+    def cancel(self, name: str) -> None:
+        """Stops the named stage early; its result is never joined."""
+        if name not in self._futures:
+            return
+        print(f"-> Cancelling background stage '{name}'...")
+        self.cancel_event(name).set()
+        self._futures[name].cancel()
+
+    def join(self, name: str) -> Any:
+        """Blocks until the named stage finishes and returns its result."""
+        if name not in self._futures:
+            raise KeyError(f"Stage '{name}' was never submitted.")
+        future = self._futures[name]
+        if not future.done():
+            print(f"-> Waiting for background stage '{name}'...")
+        return future.result()
+
+    def __enter__(self) -> "BackgroundStages":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # On failure, drop stages that have not started yet
+        self._executor.shutdown(wait=True, cancel_futures=exc_type is not None)
@@ -1,29 +1,49 @@
 import shutil
+import time
 from pathlib import Path
+from typing import List, Optional
+from domain.job import JOBS_DIR, JobContext, lock_owner_alive
 from domain.paths import Paths
 
+# Workspaces younger than this may still be acquiring their lock
+STALE_GRACE_SECONDS = 60
 
-def cleanup_data_dir() -> None:
+
+def cleanup_stale_jobs() -> None:
     """
-    Checks for the lock file. If no lock file exists, deletes all files and subdirectories
-    under the base data directory to clean it up.
+    Deletes job workspaces under the base data directory whose lock file is
+    missing or owned by a process that no longer runs. Workspaces of live
+    jobs are left untouched.
     """
-    lock_file = Paths.get_lock_file()
-    if not lock_file.exists():
-        base_dir = Paths._root
-        for item in base_dir.iterdir():
-            if item.is_file():
-                item.unlink()
-            elif item.is_dir():
-                shutil.rmtree(item)
+    jobs_dir = Paths._root / JOBS_DIR
+    if not jobs_dir.exists():
+        return
+
+    for job_root in jobs_dir.iterdir():
+        if not job_root.is_dir():
+            continue
+        lock_file = job_root / ".lock"
+        if not lock_file.exists():
+            if time.time() - job_root.stat().st_mtime < STALE_GRACE_SECONDS:
+                continue
+        elif lock_owner_alive(lock_file):
+            continue
+        print(f"-> Removing stale job workspace: {job_root.name}")
+        shutil.rmtree(job_root, ignore_errors=True)
 
 
-def move_shorts_to_final() -> None:
+def move_shorts_to_final(job: Optional[JobContext] = None) -> List[Path]:
     """
-    Moves all files from the shorts output directory to the final directory without renaming.
+    Moves all files from the shorts output directory to the final directory.
+    With a job, files get job-unique names so concurrent jobs never collide.
     """
-    short_dir = Paths.get_short_output_dir()
-    final_dir = Paths.get_final_dir()
-    for file in short_dir.iterdir():
+    paths = job or Paths
+    short_dir = paths.get_short_output_dir()
+    final_dir = paths.get_final_dir()
+    moved = []
+    for file in sorted(short_dir.iterdir()):
         if file.is_file():
-            shutil.move(str(file), str(final_dir / file.name))
+            name = job.final_name(file.name) if job else file.name
+            shutil.move(str(file), str(final_dir / name))
+            moved.append(final_dir / name)
+    return moved
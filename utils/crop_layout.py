@@ -0,0 +1,159 @@
+import math
+from typing import List, Optional
+
+from model.crop import CropRect
+from model.streamer import StreamerBBox
+
+
+def _center_crop(
+    source_w: float, source_h: float, out_width: int, out_height: int
+) -> CropRect:
+    """'Crop to Fill' the full frame into out_width x out_height."""
+    target_ratio = out_width / out_height
+    current_ratio = source_w / source_h
+
+    if current_ratio > target_ratio:
+        # Video is wider -> Crop sides
+        crop_h = source_h
+        crop_w = source_h * target_ratio
+        crop_x = (source_w - crop_w) / 2
+        crop_y = 0
+    else:
+        # Video is taller -> Crop top/bottom
+        crop_w = source_w
+        crop_h = source_w / target_ratio
+        crop_x = 0
+        crop_y = (source_h - crop_h) / 2
+
+    return CropRect(
+        x=int(crop_x),
+        y=int(crop_y),
+        width=int(crop_w),
+        height=int(crop_h),
+        out_width=out_width,
+        out_height=out_height,
+    )
+
+
+def plan_vertical_layout(
+    source_w: float,
+    source_h: float,
+    streamer_bbox: Optional[StreamerBBox] = None,
+    target_width: int = 1080,
+    target_height: int = 1920,
+    streamer_aspect_ratio: float = 6 / 16,
+) -> List[CropRect]:
+    """
+    Computes the crop rectangles of the vertical layout.
+
+    - No streamer: a single center crop filling the whole target.
+    - Streamer: [top, bottom] split where the top slot (6/16 of the height)
+      is filled from inside the BBox and the bottom slot from the center
+      of the frame.
+    """
+    if streamer_bbox is None:
+        return [_center_crop(source_w, source_h, target_width, target_height)]
+
+    top_height = int(target_height * (streamer_aspect_ratio))
+    bottom_height = target_height - top_height
+
+    # --- Top (Streamer) - "Crop to Fill" inside the BBox ---
+    bbox_x = streamer_bbox.x * source_w
+    bbox_y = streamer_bbox.y * source_h
+    bbox_w = streamer_bbox.width * source_w
+    bbox_h = streamer_bbox.height * source_h
+
+    target_top_ratio = target_width / top_height
+    current_bbox_ratio = bbox_w / bbox_h
+
+    if current_bbox_ratio > target_top_ratio:
+        # BBox is wider than target slot -> Crop sides (preserve height)
+        crop_h = bbox_h
+        crop_w = bbox_h * target_top_ratio
+    else:
+        # BBox is taller than target slot -> Crop top/bottom (preserve width)
+        crop_w = bbox_w
+        crop_h = bbox_w / target_top_ratio
+
+    # Center the crop within the BBox
+    crop_x = (bbox_x + (bbox_w / 2)) - (crop_w / 2)
+    crop_y = (bbox_y + (bbox_h / 2)) - (crop_h / 2)
+
+    top = CropRect(
+        x=int(crop_x),
+        y=int(crop_y),
+        width=int(crop_w),
+        height=int(crop_h),
+        out_width=target_width,
+        out_height=top_height,
+    )
+
+    # --- Bottom (Content) - standard center crop ---
+    bottom = _center_crop(source_w, source_h, target_width, bottom_height)
+
+    return [top, bottom]
+
+
+def layout_filter(
+    rects: List[CropRect],
+    input_label: str = "0:v",
+    output_label: str = "v",
+    label_prefix: str = "",
+) -> str:
+    """
+    Builds a filtergraph fragment that turns [input_label] into the stacked
+    vertical layout at [output_label].
+
+    label_prefix keeps intermediate labels unique when several layouts
+    share one filtergraph.
+    """
+    if not rects:
+        raise ValueError("Layout requires at least one crop rectangle.")
+
+    def crop_scale(r: CropRect) -> str:
+        return (
+            f"crop={r.width}:{r.height}:{r.x}:{r.y},"
+            f"scale={r.out_width}:{r.out_height}"
+        )
+
+    if len(rects) == 1:
+        return f"[{input_label}]{crop_scale(rects[0])}[{output_label}]"
+
+    branches = [f"{label_prefix}in{i}" for i in range(len(rects))]
+    parts = [f"[{input_label}]split={len(rects)}" + "".join(f"[{b}]" for b in branches)]
+    for i, (branch, r) in enumerate(zip(branches, rects)):
+        parts.append(f"[{branch}]{crop_scale(r)}[{label_prefix}part{i}]")
+    parts.append(
+        "".join(f"[{label_prefix}part{i}]" for i in range(len(rects)))
+        + f"vstack=inputs={len(rects)}[{output_label}]"
+    )
+    return ";".join(parts)
+
+
+def required_source_height(
+    source_aspect: float,
+    streamer_bbox: Optional[StreamerBBox] = None,
+    pixel_density: float = 1.0,
+    target_width: int = 1080,
+    target_height: int = 1920,
+    streamer_aspect_ratio: float = 6 / 16,
+) -> int:
+    """
+    Minimum source height at which every crop rectangle of the layout still
+    has pixel_density source pixels per output pixel (1.0 = no upscaling).
+    """
+    # Layout in a large reference frame, so the int() rounding is negligible
+    ref_h = 10000
+    rects = plan_vertical_layout(
+        source_aspect * ref_h,
+        ref_h,
+        streamer_bbox=streamer_bbox,
+        target_width=target_width,
+        target_height=target_height,
+        streamer_aspect_ratio=streamer_aspect_ratio,
+    )
+    upscale = max(
+        max(r.out_width / max(r.width, 1), r.out_height / max(r.height, 1))
+        for r in rects
+    )
+    return math.ceil(ref_h * upscale * pixel_density)
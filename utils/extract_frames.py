@@ -1,80 +1,97 @@
 import subprocess
-import random
-import json
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
-from domain.paths import Paths
+import numpy as np
+from PIL import Image
 
 
-def get_video_duration(video_path: Path) -> float:
-    """Helper to get exact video duration in seconds."""
-    cmd = [
-        "ffprobe",
-        "-v",
-        "error",
-        "-show_entries",
-        "format=duration",
-        "-of",
-        "json",
-        str(video_path),
-    ]
-    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-    info = json.loads(result.stdout)
-    return float(info["format"]["duration"])
+def sample_timestamps(duration: float, frame_count: int) -> List[float]:
+    """frame_count timestamps spread evenly over the video (bin centers)."""
+    return [duration * (i + 0.5) / frame_count for i in range(frame_count)]
 
 
-def extract_frames(video_path: Path, frame_count: int = 1) -> List[Path]:
+def sample_frames(
+    video_path: Path,
+    timestamps: List[float],
+    width: int,
+    height: int,
+) -> np.ndarray:
     """
-    Extracts random frames from the middle 60% of the video.
+    Decodes one frame per timestamp with a single ffmpeg process and pipes
+    them as raw RGB straight into memory (no image files).
 
-    Args:
-        video_path: Source video file.
-        frame_count: Number of frames to extract (default 1).
+    Each timestamp is opened as its own input with a keyframe-aligned seek
+    (-noaccurate_seek, -skip_frame nokey), so only one keyframe is decoded
+    per sample instead of everything up to the exact timestamp.
 
     Returns:
-        List[Path]: List of paths to the saved PNG images.
+        np.ndarray: (N, height, width, 3) uint8, N <= len(timestamps)
     """
     if not video_path.exists():
         raise FileNotFoundError(f"Video not found: {video_path}")
-
-    video_name = video_path.stem
-    output_dir = Paths.get_frame_dir()
-
-    duration = get_video_duration(video_path)
-
-    # Define Safe Zone (Avoid first 20% and last 20%)
-    safe_start = duration * 0.2
-    safe_end = duration * 0.8
-
-    if safe_end <= safe_start:
-        # Fallback for very short videos: use middle point
-        safe_start = 0.0
-        safe_end = duration
-
-    extracted_paths = []
-
-    for i in range(frame_count):
-        random_time = random.uniform(safe_start, safe_end)
-        output_filename = f"{video_name}_{i+1}.png"
-        output_path = output_dir / output_filename
-
-        # Extract Frame using FFmpeg
-        cmd = [
-            "ffmpeg",
-            "-y",
+    if not timestamps:
+        return np.zeros((0, height, width, 3), dtype=np.uint8)
+
+    cmd = ["ffmpeg", "-v", "error"]
+    for t in timestamps:
+        cmd += [
+            "-skip_frame",
+            "nokey",
+            "-noaccurate_seek",
             "-ss",
-            str(random_time),
+            f"{max(t, 0.0):.3f}",
             "-i",
             str(video_path),
-            "-vframes",
-            "1",
-            "-q:v",
-            "2",
-            str(output_path),
         ]
-        subprocess.run(cmd, check=True, capture_output=True)
 
-        extracted_paths.append(output_path)
+    chains = [
+        f"[{i}:v:0]trim=end_frame=1,setpts=PTS-STARTPTS,"
+        f"scale={width}:{height},setsar=1,format=rgb24[f{i}]"
+        for i in range(len(timestamps))
+    ]
+    inputs = "".join(f"[f{i}]" for i in range(len(timestamps)))
+    chains.append(f"{inputs}concat=n={len(timestamps)}:v=1:a=0[out]")
+
+    cmd += [
+        "-filter_complex",
+        ";".join(chains),
+        "-map",
+        "[out]",
+        "-frames:v",
+        str(len(timestamps)),
+        # One output frame per sample: no duplicates to fill timestamp gaps
+        "-fps_mode",
+        "passthrough",
+        "-f",
+        "rawvideo",
+        "-pix_fmt",
+        "rgb24",
+        "pipe:1",
+    ]
+    result = subprocess.run(cmd, check=True, capture_output=True)
+
+    frame_size = width * height * 3
+    count = len(result.stdout) // frame_size
+    return np.frombuffer(result.stdout[: count * frame_size], dtype=np.uint8).reshape(
+        count, height, width, 3
+    )
 
-    return extracted_paths
+
+def to_gray(
+    frames: np.ndarray, width: Optional[int] = None, height: Optional[int] = None
+) -> np.ndarray:
+    """
+    (N, H, W, 3) RGB frames -> (N, height, width) uint8 grayscale,
+    optionally downscaled.
+    """
+    gray = []
+    for frame in frames:
+        img = Image.fromarray(frame).convert("L")
+        if width and height and img.size != (width, height):
+            img = img.resize((width, height), Image.BILINEAR)
+        gray.append(np.asarray(img))
+
+    if not gray:
+        return np.zeros((0, height or frames.shape[1], width or frames.shape[2]), dtype=np.uint8)
+    return np.stack(gray)
@@ -1,6 +1,8 @@
 import json
 from pathlib import Path
 
+from model.llm_usage import LLMUsage
+
 
 def extract_json(text: str) -> dict:
     """
@@ -17,3 +19,17 @@ def load_system_prompt(path: Path) -> str:
     if not path.exists():
         raise FileNotFoundError(path)
     return path.read_text(encoding="utf-8")
+
+
+def read_usage(response, label: str, model: str, latency: float) -> LLMUsage:
+    """Token counts of a google-genai response (0 where not reported)."""
+    meta = getattr(response, "usage_metadata", None)
+    usage = LLMUsage(
+        label=label,
+        model=model,
+        input_tokens=getattr(meta, "prompt_token_count", None) or 0,
+        output_tokens=getattr(meta, "candidates_token_count", None) or 0,
+        latency=latency,
+    )
+    print(f"-> LLM usage {usage}")
+    return usage
@@ -0,0 +1,233 @@
+import json
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+import numpy as np
+
+# JSONL transcripts: first line is a header {"language", "mode"}, every
+# following line is one record (a sentence segment or a word).
+RECORDS_KEY = {"sentence": "segments", "word": "words"}
+
+
+class JsonlTranscriptWriter:
+    """
+    Appends transcript records to a .jsonl file as they are produced,
+    so nothing but the current window has to stay in memory.
+    """
+
+    def __init__(self, path: Path, mode: str):
+        self.path = path
+        self.mode = mode
+        self._file: Optional[TextIO] = open(path, "w", encoding="utf-8")
+        self._header_written = False
+
+    def write_header(self, language: str) -> None:
+        if self._header_written:
+            return
+        self._write({"language": language, "mode": self.mode})
+        self._header_written = True
+
+    def write(self, record: dict) -> None:
+        if not self._header_written:
+            raise RuntimeError("write_header() must be called before records.")
+        self._write(record)
+
+    def _write(self, obj: dict) -> None:
+        self._file.write(json.dumps(obj, ensure_ascii=False) + "\n")
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "JsonlTranscriptWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def iter_jsonl_records(path: Path) -> Iterator[dict]:
+    """Yields records of a .jsonl transcript one by one (header skipped)."""
+    with open(path, "r", encoding="utf-8") as f:
+        f.readline()
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_transcript(path: Path) -> dict:
+    """
+    Loads a sentence or word transcript in any format (.json / .jsonl /
+    .tcol) into the JSON layout: {"language", "mode", "segments" | "words"}.
+    """
+    if not path.exists():
+        raise FileNotFoundError(path)
+
+    if path.suffix == COLUMNAR_SUFFIX:
+        return ColumnarTranscript(path).to_dict()
+
+    if path.suffix != ".jsonl":
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    with open(path, "r", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+    mode = header.get("mode", "sentence")
+    return {
+        "language": header.get("language"),
+        "mode": mode,
+        RECORDS_KEY[mode]: list(iter_jsonl_records(path)),
+    }
+
+
+# --- Columnar format (.tcol) ---
+# One file: magic, uint32 header length, JSON header, then 64-byte aligned
+# columns (start/end float64, speaker uint16 into the header's speaker
+# table, text offsets int64 into a packed UTF-8 blob). The whole file is
+# memory-mapped on read; no per-record objects exist until asked for.
+COLUMNAR_SUFFIX = ".tcol"
+COLUMNAR_MAGIC = b"TCOL1\n"
+_ALIGN = 64
+
+
+def _aligned(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def write_columnar(
+    path: Path, language: Optional[str], mode: str, records: Iterable[dict]
+) -> Path:
+    """Writes sentence/word records ({start, end, text, speaker}) as .tcol."""
+    starts = array("d")
+    ends = array("d")
+    speaker_ids = array("H")
+    offsets = array("q", [0])
+    blob = bytearray()
+    speakers: Dict[str, int] = {}
+
+    for r in records:
+        starts.append(r["start"])
+        ends.append(r["end"])
+        speaker = r.get("speaker", "SPEAKER_00")
+        speaker_ids.append(speakers.setdefault(speaker, len(speakers)))
+        blob += r["text"].encode("utf-8")
+        offsets.append(len(blob))
+
+    columns = [
+        ("start", "<f8", starts.tobytes()),
+        ("end", "<f8", ends.tobytes()),
+        ("speaker", "<u2", speaker_ids.tobytes()),
+        ("text_offsets", "<i8", offsets.tobytes()),
+        ("text", "|u1", bytes(blob)),
+    ]
+
+    # Column offsets depend on the header size, which depends on the offsets
+    layout: Dict[str, dict] = {}
+    header = b""
+    while True:
+        position = _aligned(len(COLUMNAR_MAGIC) + 4 + len(header))
+        for name, dtype, data in columns:
+            layout[name] = {"dtype": dtype, "offset": position, "nbytes": len(data)}
+            position = _aligned(position + len(data))
+        new_header = json.dumps(
+            {
+                "language": language,
+                "mode": mode,
+                "count": len(starts),
+                "speakers": list(speakers),
+                "columns": layout,
+            }
+        ).encode("utf-8")
+        stable = len(new_header) == len(header)
+        header = new_header
+        if stable:
+            break
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(COLUMNAR_MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for name, _, data in columns:
+            f.write(b"\0" * (layout[name]["offset"] - f.tell()))
+            f.write(data)
+    os.replace(tmp_path, path)
+    return path
+
+
+class ColumnarTranscript:
+    """Read-only, memory-mapped view of a .tcol transcript."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+                raise ValueError(f"Not a columnar transcript: {path}")
+            (header_len,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(header_len))
+
+        self.language: Optional[str] = header["language"]
+        self.mode: str = header["mode"]
+        self.speakers: List[str] = header["speakers"]
+        self._count: int = header["count"]
+
+        raw = np.memmap(path, dtype=np.uint8, mode="r")
+        cols = header["columns"]
+
+        def column(name: str) -> np.ndarray:
+            c = cols[name]
+            return raw[c["offset"] : c["offset"] + c["nbytes"]].view(np.dtype(c["dtype"]))
+
+        self.starts = column("start")
+        self.ends = column("end")
+        self.speaker_ids = column("speaker")
+        self.text_offsets = column("text_offsets")
+        self._text = column("text")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def text(self, i: int) -> str:
+        lo, hi = self.text_offsets[i], self.text_offsets[i + 1]
+        return self._text[lo:hi].tobytes().decode("utf-8")
+
+    def record(self, i: int) -> dict:
+        return {
+            "start": float(self.starts[i]),
+            "end": float(self.ends[i]),
+            "text": self.text(i),
+            "speaker": self.speakers[self.speaker_ids[i]],
+        }
+
+    def __iter__(self) -> Iterator[dict]:
+        return (self.record(i) for i in range(self._count))
+
+    def to_dict(self) -> dict:
+        return {
+            "language": self.language,
+            "mode": self.mode,
+            RECORDS_KEY[self.mode]: list(self),
+        }
+
+
+def convert_to_columnar(path: Path, remove_source: bool = True) -> Path:
+    """Rewrites a .json/.jsonl transcript as .tcol next to it."""
+    out_path = path.with_suffix(COLUMNAR_SUFFIX)
+    if path.suffix == ".jsonl":
+        with open(path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+        mode = header.get("mode", "sentence")
+        write_columnar(out_path, header.get("language"), mode, iter_jsonl_records(path))
+    else:
+        data = read_transcript(path)
+        write_columnar(out_path, data["language"], data["mode"], data[RECORDS_KEY[data["mode"]]])
+    if remove_source:
+        path.unlink()
+    return out_path
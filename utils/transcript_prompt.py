@@ -0,0 +1,41 @@
+import re
+from typing import Dict, List, Optional
+
+# Bump when the row layout changes (part of the chapters cache key)
+ENCODING_VERSION = "rows-v1"
+
+_SPEAKER_NUMBER = re.compile(r"(\d+)$")
+
+
+def speaker_tag(speaker: Optional[str], tags: Dict[str, str]) -> str:
+    """Short, stable tag per speaker: 'SPEAKER_03' -> 'S3'."""
+    speaker = speaker or "SPEAKER_00"
+    if speaker not in tags:
+        match = _SPEAKER_NUMBER.search(speaker)
+        tags[speaker] = f"S{int(match.group(1))}" if match else f"S{len(tags)}"
+    return tags[speaker]
+
+
+def encode_transcript(
+    segments: List[dict],
+    language: Optional[str] = None,
+    precision: int = 1,
+) -> str:
+    """
+    Line-oriented prompt encoding of sentence segments:
+
+        lang=de
+        12.3|15.8|S0|text of the segment
+
+    Timestamps are rounded to `precision` decimals, speakers become short
+    tags and no JSON punctuation is repeated per segment.
+    """
+    tags: Dict[str, str] = {}
+    lines = [f"lang={language or 'unknown'}"]
+    for seg in segments:
+        text = " ".join(seg["text"].split()).replace("|", "/")
+        lines.append(
+            f"{seg['start']:.{precision}f}|{seg['end']:.{precision}f}|"
+            f"{speaker_tag(seg.get('speaker'), tags)}|{text}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,19 @@
+import hashlib
+
+import yt_dlp
+
+
+def resolve_video_id(url: str) -> str:
+    """
+    Resolves the extractor video id of a URL without network access.
+    Falls back to a hash of the URL when no extractor can parse an id.
+    """
+    for ie in yt_dlp.extractor.gen_extractor_classes():
+        if ie.ie_key() == "Generic" or not ie.suitable(url):
+            continue
+        video_id = ie.get_temp_id(url)
+        if video_id:
+            return str(video_id)
+        break
+
+    return "url-" + hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
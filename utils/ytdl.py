@@ -0,0 +1,61 @@
+import json
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+import yt_dlp
+from yt_dlp.utils import DownloadCancelled, DownloadError, parse_bytes
+
+from core.config import (
+    DOWNLOAD_CONCURRENT_FRAGMENTS,
+    DOWNLOAD_RATE_LIMIT,
+    DOWNLOAD_THROTTLED_RATE,
+)
+
+
+def base_options(quiet: bool = False) -> dict:
+    """yt-dlp options shared by every download (fragments, rate limits)."""
+    opts = {
+        "quiet": quiet,
+        "no_warnings": True,
+        "concurrent_fragment_downloads": DOWNLOAD_CONCURRENT_FRAGMENTS,
+    }
+    if DOWNLOAD_RATE_LIMIT:
+        opts["ratelimit"] = parse_bytes(DOWNLOAD_RATE_LIMIT)
+    if DOWNLOAD_THROTTLED_RATE:
+        # Re-extracts the format URLs when throttled below this rate
+        opts["throttledratelimit"] = parse_bytes(DOWNLOAD_THROTTLED_RATE)
+    return opts
+
+
+def cancel_hook(cancel: threading.Event) -> Callable[[dict], None]:
+    """Progress hook that aborts the download once `cancel` is set."""
+
+    def hook(_progress: dict) -> None:
+        if cancel.is_set():
+            raise DownloadCancelled("Download cancelled")
+
+    return hook
+
+
+def load_info(info_path: Path) -> dict:
+    with open(info_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def extract(youtube_url: str, ydl_opts: dict, info_path: Optional[Path] = None) -> dict:
+    """
+    Downloads with ydl_opts and returns the processed info dict.
+
+    With info_path (see service.resolve_info), the cached metadata is reused
+    instead of a new extraction round-trip; if its format URLs have expired
+    the URL is extracted again.
+    """
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        if info_path is not None and info_path.exists():
+            info = ydl.sanitize_info(load_info(info_path))
+            try:
+                return ydl.process_ie_result(info, download=True)
+            except DownloadError as e:
+                print(f"Warning: Cached info failed ({e}), extracting again...")
+        return ydl.extract_info(youtube_url, download=True)